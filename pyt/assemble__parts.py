@@ -0,0 +1,252 @@
+import os, sys
+import numpy as np
+import gmsh
+
+
+# ========================================================= #
+# ===  volumes created since a snapshot                 === #
+# ========================================================= #
+
+def volumes__snapshot():
+    return( set( [ tag for dim,tag in gmsh.model.occ.getEntities( 3 ) ] ) )
+
+def volumes__since( before=None ):
+    #  -- removed volumes ( e.g. by cut ) are dropped, new ones kept in tag order --  #
+    return( sorted( volumes__snapshot() - before ) )
+
+
+# ========================================================= #
+# ===  record a part :: name -> input volume tags       === #
+# ========================================================= #
+
+def record__part( parts=None, name=None, before=None, volumes=None ):
+
+    #  -- parts :: list of ( name, [tags] ), kept in build order --  #
+    if ( volumes is None ):
+        volumes = volumes__since( before=before )
+    parts.append( ( name, [ int( tag ) for tag in volumes ] ) )
+    return( parts )
+
+
+# ========================================================= #
+# ===  single fragment of all parts                     === #
+# ========================================================= #
+
+def assemble__parts( parts=None, outFile=None ):
+
+    # ------------------------------------------------- #
+    # --- [1] one fragment ( no intermediate dedup )--- #
+    # ------------------------------------------------- #
+    mapping = fragment__mapping( mapping=parts )
+
+    # ------------------------------------------------- #
+    # --- [2] write mapping                         --- #
+    # ------------------------------------------------- #
+    if ( outFile is not None ):
+        with open( outFile, "w" ) as f:
+            f.write( "# name\t\tvolumes\n" )
+            for name,tags in mapping.items():
+                f.write( "{0}\t\t{1}\n".format( name, " ".join( [ str( tag ) for tag in tags ] ) ) )
+        print( "[assemble__parts] outFile :: {0}".format( outFile ) )
+    return( mapping )
+
+
+# ========================================================= #
+# ===  fragment of all volumes, names carried by map    === #
+# ========================================================= #
+
+def fragment__mapping( mapping=None ):
+
+    # ------------------------------------------------- #
+    # --- [1] all input volumes in build order      --- #
+    # ------------------------------------------------- #
+    #  -- mapping :: { name:[tags] } or [ ( name, [tags] ), ... ]   --  #
+    #  -- volumes outside any part are appended as "others"        --  #
+    items   = list( mapping.items() ) if ( isinstance( mapping, dict ) ) else list( mapping )
+    listed  = set( [ tag for name,tags in items for tag in tags ] )
+    others  = sorted( volumes__snapshot() - listed )
+    if ( len( others ) > 0 ):
+        items = items + [ ( "others", others ) ]
+    names   = [ name for name,tags in items for tag in tags ]
+    inputs  = [ (3,tag) for name,tags in items for tag in tags ]
+    if ( len( inputs ) == 0 ):
+        return( {} )
+
+    # ------------------------------------------------- #
+    # --- [2] fragment ( = removeAllDuplicates )    --- #
+    # ------------------------------------------------- #
+    #  -- outDimTagsMap[i] :: output volumes of inputs[i]            --  #
+    #  -- a piece shared by overlapping inputs goes to the first one --  #
+    out, outMap = gmsh.model.occ.fragment( inputs[:1], inputs[1:] )
+    gmsh.model.occ.synchronize()
+    ret, owned  = {}, set()
+    for name,dimtags in zip( names, outMap ):
+        tags    = ret.setdefault( name, [] )
+        for dim,tag in dimtags:
+            if ( ( dim == 3 ) and not( tag in owned ) ):
+                tags.append( tag )
+                owned.add( tag )
+    return( { name:tags for name,tags in ret.items() if ( len( tags ) > 0 ) } )
+
+
+# ========================================================= #
+# ===  record named regions of a part                   === #
+# ========================================================= #
+
+def record__regions( parts=None, regions=None, suffix=None ):
+
+    #  -- regions :: { region:[tags] } -> parts "<region>_<suffix>" ( e.g. gap_right ) --  #
+    for region,tags in regions.items():
+        record__part( parts, "{0}_{1}".format( region, suffix ), volumes=tags )
+    return( parts )
+
+def region__ofName( name=None ):
+    return( name.split( "_" )[0] )
+
+
+# ========================================================= #
+# ===  volume signature :: bounding box & mass          === #
+# ========================================================= #
+
+def signature__volumes( tags=None ):
+    #  -- ( xmin, ymin, zmin, xmax, ymax, zmax, mass ) per volume --  #
+    ret = [ list( gmsh.model.occ.getBoundingBox( 3, int( tag ) ) ) \
+            + [ gmsh.model.occ.getMass( 3, int( tag ) ) ] for tag in tags ]
+    return( np.reshape( np.array( ret, dtype=np.float64 ), (-1,7) ) )
+
+def sign__mapping( mapping=None ):
+
+    #  -- mapping :: { name:[tags] } or [ ( name, [tags] ), ... ] --  #
+    items   = mapping.items() if ( isinstance( mapping, dict ) ) else mapping
+    names   = [ name for name,tags in items for tag in tags ]
+    tags    = [ tag  for name,tags in items for tag in tags ]
+    return( { "names":names, "values":signature__volumes( tags ) } )
+
+
+# ========================================================= #
+# ===  names of current volumes from signatures         === #
+# ========================================================= #
+
+def match__mapping( signs=None, tags=None, tolerance=1.e-4 ):
+
+    # ------------------------------------------------- #
+    # --- [1] signatures of current volumes         --- #
+    # ------------------------------------------------- #
+    #  -- names of volumes restored after a STEP round trip ( same shapes ) --  #
+    #  -- tags :: volumes to be named ( default: all ), unmatched -> others  --  #
+    if ( tags is None ):
+        tags    = sorted( volumes__snapshot() )
+    cur         = signature__volumes( tags )
+    ref         = signs["values"]
+    if ( ( cur.shape[0] == 0 ) or ( ref.shape[0] == 0 ) ):
+        return( { "others":list( tags ) } if ( len( tags ) > 0 ) else {} )
+    scale       = tolerance * np.max( ref[:,3:6] - ref[:,0:3] )
+
+    # ------------------------------------------------- #
+    # --- [2] equal bbox & mass                     --- #
+    # ------------------------------------------------- #
+    same        = np.all( np.abs( cur[:,None,:6] - ref[None,:,:6] ) <= scale, axis=2 ) & \
+        ( np.abs( cur[:,None,6] - ref[None,:,6] ) <= tolerance * ref[None,:,6] )
+    best        = np.argmax( same, axis=1 )
+    found       = np.any( same, axis=1 )
+
+    # ------------------------------------------------- #
+    # --- [3] name -> tags                          --- #
+    # ------------------------------------------------- #
+    mapping     = {}
+    for tag,ik,hit in zip( tags, best, found ):
+        name    = signs["names"][ik] if ( hit ) else "others"
+        mapping.setdefault( name, [] ).append( int( tag ) )
+    return( mapping )
+
+
+# ========================================================= #
+# ===  signatures of a STEP file ( <stpFile>.parts )    === #
+# ========================================================= #
+
+def write__signatures( signs=None, outFile=None ):
+    with open( outFile, "w" ) as f:
+        f.write( "# name\t\txmin ymin zmin xmax ymax zmax mass\n" )
+        for name,value in zip( signs["names"], signs["values"] ):
+            f.write( "{0}\t\t{1}\n".format( name, " ".join( [ repr( float( val ) ) for val in value ] ) ) )
+    return( outFile )
+
+def load__signatures( inpFile=None ):
+    if ( not( os.path.exists( inpFile ) ) ):
+        return( None )
+    names, values = [], []
+    with open( inpFile, "r" ) as f:
+        for line in f:
+            words = line.split()
+            if ( ( len( words ) == 0 ) or words[0].startswith( "#" ) ):
+                continue
+            names .append( words[0] )
+            values.append( [ float( word ) for word in words[1:8] ] )
+    return( { "names":names, "values":np.reshape( np.array( values, dtype=np.float64 ), (-1,7) ) } )
+
+
+# ========================================================= #
+# ===  physical table from region names                 === #
+# ========================================================= #
+
+def write__physTable( mapping=None, meshFile="dat/mesh.conf", outFile=None ):
+
+    # ------------------------------------------------- #
+    # --- [1] region name -> physNum ( mesh.conf )  --- #
+    # ------------------------------------------------- #
+    import nkUtilities.load__table2dictarr as ltd
+    meshes  = ltd.load__table2dictarr( inpFile=meshFile )
+    physNum = { mesh["key"]:int( mesh["physNum"] ) for mesh in meshes }
+
+    # ------------------------------------------------- #
+    # --- [2] one row per volume, grouped by region --- #
+    # ------------------------------------------------- #
+    #  -- same format as phys_*.conf :: key, type, entity, physNum --  #
+    #  -- a volume without physical group would drop out of the mesh --  #
+    rows, missing = [], []
+    for name,tags in mapping.items():
+        region = region__ofName( name )
+        if ( not( region in physNum ) ):
+            missing += [ ( name, tags ) ]
+            continue
+        rows += [ ( "{0}_{1}".format( name, ik+1 ), tag, physNum[region] ) for ik,tag in enumerate( tags ) ]
+    if ( len( missing ) > 0 ):
+        sys.exit( "[write__physTable] volumes without region in {0} :: {1} ??? ".format( meshFile, missing ) )
+    rows    = sorted( rows, key=lambda row: ( row[2], row[1] ) )
+    with open( outFile, "w" ) as f:
+        f.write( "# key\t\ttype\t\tentity\t\tphysNum\n" )
+        for key,tag,num in rows:
+            f.write( "{0}\t\tvolu\t\t{1}\t\t{2}\n".format( key, tag, num ) )
+    print( "[write__physTable] outFile :: {0}".format( outFile ) )
+    return( outFile )
+
+
+# ========================================================= #
+# ===  check a hand-written physical table by names     === #
+# ========================================================= #
+
+def check__physTable( mapping=None, physFile=None, meshFile="dat/mesh.conf" ):
+
+    # ------------------------------------------------- #
+    # --- [1] physNum of each volume from its name  --- #
+    # ------------------------------------------------- #
+    #  -- phys_*.conf are numbered by entity order :: the assembled volumes must  --  #
+    #  -- carry the same numbers, i.e. volume tag -> region -> physNum agrees     --  #
+    import nkUtilities.load__table2dictarr as ltd
+    meshes   = ltd.load__table2dictarr( inpFile=meshFile )
+    physNum  = { mesh["key"]:int( mesh["physNum"] ) for mesh in meshes }
+    expected = { tag:physNum.get( region__ofName( name ) ) for name,tags in mapping.items() for tag in tags }
+
+    # ------------------------------------------------- #
+    # --- [2] compare with the table                --- #
+    # ------------------------------------------------- #
+    rows     = [ row for row in ltd.load__table2dictarr( inpFile=physFile ) if ( row["type"] == "volu" ) ]
+    table    = { int( row["entity"] ):int( row["physNum"] ) for row in rows }
+    wrong    = sorted( [ ( tag, num, expected.get( tag ) ) for tag,num in table.items() \
+                         if ( expected.get( tag ) != num ) ] )
+    absent   = sorted( set( expected.keys() ) - set( table.keys() ) )
+    if ( ( len( wrong ) > 0 ) or ( len( absent ) > 0 ) ):
+        sys.exit( "[check__physTable] {0} does not match the assembled volumes ( use mesh.physical name ) :: "\
+                  "( entity, physNum, by name ) {1}, not in table {2} ??? ".format( physFile, wrong, absent ) )
+    print( "[check__physTable] {0} :: {1} volumes agree with part names".format( physFile, len( table ) ) )
+    return( physFile )
@@ -0,0 +1,78 @@
+import os, sys
+import gmsh
+
+
+# ========================================================= #
+# ===  mesh size by fields ( one per physical group )   === #
+# ========================================================= #
+
+def assign__meshField( meshFile="dat/mesh.conf", physFile="dat/phys_right.conf", grading=0.0 ):
+
+    # ------------------------------------------------- #
+    # --- [1] load tables                           --- #
+    # ------------------------------------------------- #
+    #  -- meshFile :: key, physNum, resolution      --  #
+    #  -- physFile :: key, type, entity, physNum    --  #
+    import nkUtilities.load__table2dictarr as ltd
+    meshes  = ltd.load__table2dictarr( inpFile=meshFile )
+    physs   = ltd.load__table2dictarr( inpFile=physFile )
+    sizes   = { int( mesh["physNum"] ):float( mesh["resolution"] ) for mesh in meshes }
+    names   = { int( mesh["physNum"] ):mesh["key"]                 for mesh in meshes }
+    dims    = { "point":0, "line":1, "surf":2, "volu":3 }
+
+    # ------------------------------------------------- #
+    # --- [2] group entities & physical groups      --- #
+    # ------------------------------------------------- #
+    groups  = {}
+    for phys in physs:
+        key = ( dims[ phys["type"].lower() ], int( phys["physNum"] ) )
+        groups.setdefault( key, [] ).append( int( phys["entity"] ) )
+    for (dim,physNum),entities in groups.items():
+        gmsh.model.addPhysicalGroup( dim, entities, tag=physNum )
+        if ( physNum in names ):
+            gmsh.model.setPhysicalName( dim, physNum, names[physNum] )
+
+    # ------------------------------------------------- #
+    # --- [3] Constant field per group ( + grading )--- #
+    # ------------------------------------------------- #
+    #  -- grading > 0 :: size grows from the group's boundary up to   --  #
+    #  --                the coarsest resolution over this distance   --  #
+    sizeMax = max( sizes.values() )
+    fields  = []
+    for (dim,physNum),entities in groups.items():
+        if ( ( dim < 2 ) or not( physNum in sizes ) ):
+            continue
+        listName = { 2:"SurfacesList", 3:"VolumesList" }[dim]
+        field    = gmsh.model.mesh.field.add( "Constant" )
+        gmsh.model.mesh.field.setNumber ( field, "VIn" , sizes[physNum] )
+        gmsh.model.mesh.field.setNumber ( field, "VOut", sizeMax        )
+        gmsh.model.mesh.field.setNumbers( field, listName, entities     )
+        fields.append( field )
+        if ( ( grading > 0.0 ) and ( sizes[physNum] < sizeMax ) ):
+            if ( dim == 3 ):
+                bounds = gmsh.model.getBoundary( [ (dim,ent) for ent in entities ], \
+                                                 combined=True, oriented=False )
+                bounds = [ abs( tag ) for bdim,tag in bounds ]
+            else:
+                bounds = entities
+            dist     = gmsh.model.mesh.field.add( "Distance" )
+            gmsh.model.mesh.field.setNumbers( dist, "SurfacesList", bounds )
+            thrs     = gmsh.model.mesh.field.add( "Threshold" )
+            gmsh.model.mesh.field.setNumber ( thrs, "InField", dist )
+            gmsh.model.mesh.field.setNumber ( thrs, "SizeMin", sizes[physNum] )
+            gmsh.model.mesh.field.setNumber ( thrs, "SizeMax", sizeMax        )
+            gmsh.model.mesh.field.setNumber ( thrs, "DistMin", 0.0            )
+            gmsh.model.mesh.field.setNumber ( thrs, "DistMax", grading        )
+            fields.append( thrs )
+
+    # ------------------------------------------------- #
+    # --- [4] Min field as background mesh          --- #
+    # ------------------------------------------------- #
+    background = gmsh.model.mesh.field.add( "Min" )
+    gmsh.model.mesh.field.setNumbers( background, "FieldsList", fields )
+    gmsh.model.mesh.field.setAsBackgroundMesh( background )
+    gmsh.option.setNumber( "Mesh.MeshSizeExtendFromBoundary", 0 )
+    gmsh.option.setNumber( "Mesh.MeshSizeFromPoints"       , 0 )
+    gmsh.option.setNumber( "Mesh.MeshSizeFromCurvature"    , 0 )
+    ret     = { "groups":groups, "sizes":sizes, "fields":fields, "background":background }
+    return( ret )
@@ -0,0 +1,127 @@
+import os, sys
+import numpy as np
+import gmsh
+
+
+# ========================================================= #
+# ===  transfinite ( hexa ) mesh on eligible volumes    === #
+# ========================================================= #
+
+def assign__transfinite( meshFile="dat/mesh.conf", topo=None, recombine=True, nSmooth=100 ):
+
+    # ------------------------------------------------- #
+    # --- [1] resolution of each physical group     --- #
+    # ------------------------------------------------- #
+    import nkUtilities.load__table2dictarr as ltd
+    import build__topology                 as btp
+    meshes  = ltd.load__table2dictarr( inpFile=meshFile )
+    if ( topo is None ):
+        topo = btp.build__topology()
+
+    # ------------------------------------------------- #
+    # --- [2] volumes of hexa / prism topology      --- #
+    # ------------------------------------------------- #
+    #  -- others are left to the tetra mesher ( fall back ) --  #
+    volus, resos = [], []
+    for mesh in meshes:
+        rows  = btp.rows__ofPhysical( topo, 3, int( mesh["physNum"] ) )
+        rows  = btp.select__hexCandidates( topo, rows=rows )
+        volus.append( rows )
+        resos.append( np.full( rows.shape, float( mesh["resolution"] ) ) )
+    volus, resos = np.concatenate( volus ), np.concatenate( resos )
+    if ( volus.shape[0] == 0 ):
+        print( "[assign__transfinite] no hexa candidate volume. " )
+        return( { "volumes":[], "surfaces":[], "curves":[] } )
+    faces, nFaces = btp.gather__csr( *topo["down"][3], volus )
+    surfs         = np.unique( faces )
+    curves        = btp.closure__ofRows( topo, 3, volus, toDim=1 )
+
+    # ------------------------------------------------- #
+    # --- [3] nodes per curve from resolution       --- #
+    # ------------------------------------------------- #
+    #  -- finest resolution among the volumes sharing the curve --  #
+    reso          = np.full( topo["tags"][1].shape, np.inf )
+    edges, nEdges = btp.gather__csr( *topo["down"][2], faces )
+    np.minimum.at( reso, edges, np.repeat( np.repeat( resos, nFaces ), nEdges ) )
+    length        = np.array( [ gmsh.model.occ.getMass( 1, int( tag ) ) \
+                                for tag in btp.tag__ofRows( topo, 1, curves ) ] )
+    nNodes        = np.zeros( topo["tags"][1].shape, dtype=np.int64 )
+    nNodes[curves]= np.maximum( 2, np.ceil( length / reso[curves] ).astype( np.int64 ) + 1 )
+
+    # ------------------------------------------------- #
+    # --- [4] equal counts on opposite edges        --- #
+    # ------------------------------------------------- #
+    #  -- opposite edges of a quad face share no point; classes are --  #
+    #  -- merged over all faces & volumes ( union by min. label )    --  #
+    quads         = surfs[ np.diff( topo["down"][2][0] )[surfs] == 4 ]
+    quadEdges     = np.reshape( btp.gather__csr( *topo["down"][2], quads )[0], (-1,4) )
+    pairs         = []
+    for i1,i2 in [ (0,1),(0,2),(0,3),(1,2),(1,3),(2,3) ]:
+        pts1      = btp.gather__csr( *topo["down"][1], quadEdges[:,i1] )
+        pts2      = btp.gather__csr( *topo["down"][1], quadEdges[:,i2] )
+        shared    = share__points( pts1, pts2 )
+        pairs.append( quadEdges[~shared][:,[i1,i2]] )
+    pairs         = np.concatenate( pairs, axis=0 )
+    label         = np.arange( topo["tags"][1].shape[0] )
+    while ( True ):
+        lmin      = np.minimum( label[pairs[:,0]], label[pairs[:,1]] )
+        before    = np.copy( label )
+        np.minimum.at( label, pairs[:,0], lmin )
+        np.minimum.at( label, pairs[:,1], lmin )
+        label     = label[label]
+        if ( np.array_equal( label, before ) ):
+            break
+    nClass        = np.zeros( label.shape, dtype=np.int64 )
+    np.maximum.at( nClass, label, nNodes )
+    nNodes        = nClass[label]
+
+    # ------------------------------------------------- #
+    # --- [5] set transfinite / recombine           --- #
+    # ------------------------------------------------- #
+    #  -- no quads on tetra :: a volume touching tetra ( directly, or via its   --  #
+    #  -- neighbours ) keeps triangular faces and is meshed as structured tetra --  #
+    surfDim, voluDim = 2, 3
+    hexas         = np.copy( volus )
+    while ( True ):
+        tetras    = np.setdiff1d( np.arange( topo["tags"][3].shape[0] ), hexas )
+        onTetra   = np.unique( btp.gather__csr( *topo["down"][3], tetras )[0] )
+        hexFaces  = btp.gather__csr( *topo["down"][3], hexas )
+        touched   = np.repeat( np.arange( hexas.shape[0] ), hexFaces[1] )[ np.isin( hexFaces[0], onTetra ) ]
+        if ( touched.shape[0] == 0 ):
+            break
+        hexas     = np.delete( hexas, np.unique( touched ) )
+    recombs       = np.intersect1d( btp.gather__csr( *topo["down"][3], hexas )[0], quads )
+    for row in curves:
+        gmsh.model.mesh.setTransfiniteCurve( int( topo["tags"][1][row] ), int( nNodes[row] ) )
+    for tag in btp.tag__ofRows( topo, 2, surfs ):
+        gmsh.model.mesh.setTransfiniteSurface( int( tag ) )
+    if ( recombine ):
+        for tag in btp.tag__ofRows( topo, 2, recombs ):
+            gmsh.model.mesh.setRecombine( surfDim, int( tag ) )
+            gmsh.model.mesh.setSmoothing( surfDim, int( tag ), nSmooth )
+    for tag in btp.tag__ofRows( topo, 3, volus ):
+        gmsh.model.mesh.setTransfiniteVolume( int( tag ) )
+    print( "[assign__transfinite] {0} / {1} volumes are transfinite ( {2} recombinable ). ".format( \
+        volus.shape[0], topo["tags"][3].shape[0], hexas.shape[0] ) )
+    ret = { "volumes" :btp.tag__ofRows( topo, 3, volus  ), \
+            "surfaces":btp.tag__ofRows( topo, 2, surfs  ), \
+            "curves"  :btp.tag__ofRows( topo, 1, curves ) }
+    return( ret )
+
+
+# ========================================================= #
+# ===  two curves share an end point ?                  === #
+# ========================================================= #
+
+def share__points( pts1=None, pts2=None ):
+
+    #  -- pts :: ( indices, counts ) from gather__csr ( <= 2 points / curve ) --  #
+    def padded( pts ):
+        ret            = np.full( ( pts[1].shape[0], 2 ), -1, dtype=np.int64 )
+        owner          = np.repeat( np.arange( pts[1].shape[0] ), pts[1] )
+        rank           = np.arange( owner.shape[0] ) - np.repeat( np.cumsum( pts[1] ) - pts[1], pts[1] )
+        ret[owner,rank]= pts[0]
+        return( ret )
+    p1, p2  = padded( pts1 ), padded( pts2 )
+    hit     = ( p1[:,:,None] == p2[:,None,:] ) & ( p1[:,:,None] >= 0 )
+    return( np.any( hit, axis=(1,2) ) )
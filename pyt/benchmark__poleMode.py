@@ -0,0 +1,82 @@
+import os, sys, time, resource
+import multiprocessing
+import gmsh
+
+
+# ========================================================= #
+# ===  benchmark of pole generation ( occ / discrete )  === #
+# ========================================================= #
+#  -- experiment :: the discrete pole is a pole-only model ( no OCC fragment / --  #
+#  -- STEP with the other parts ), so it is not a mode of make__magnet         --  #
+
+def benchmark__poleMode( modes=["occ","discrete"], meshsize=0.05 ):
+
+    # ------------------------------------------------- #
+    # --- [1] load config                           --- #
+    # ------------------------------------------------- #
+    cnsFile = "dat/parameter.conf"
+    import nkUtilities.load__constants as lcn
+    const   = lcn.load__constants( inpFile=cnsFile )
+
+    # ------------------------------------------------- #
+    # --- [2] run each mode in a fresh process      --- #
+    # ------------------------------------------------- #
+    #  -- peak RSS is per process, so isolate each mode  -- #
+    results = []
+    for mode in modes:
+        queue   = multiprocessing.Queue()
+        process = multiprocessing.Process( target=run__poleMode, \
+                                           args=( queue, mode, const, meshsize ) )
+        process.start()
+        results.append( queue.get() )
+        process.join()
+
+    # ------------------------------------------------- #
+    # --- [3] display                               --- #
+    # ------------------------------------------------- #
+    print()
+    print( "[benchmark__poleMode] side == {0}".format( const["geometry.side"] ) )
+    print( "{0:>10} {1:>12} {2:>12} {3:>14} {4:>10} {5:>12}".format( \
+        "mode", "model[s]", "mesh[s]", "peakRSS[MB]", "nodes", "elements" ) )
+    for ret in results:
+        print( "{0:>10} {1:>12.3f} {2:>12.3f} {3:>14.1f} {4:>10d} {5:>12d}".format( \
+            ret["mode"], ret["t_model"], ret["t_mesh"], ret["peakRSS"], \
+            ret["nNodes"], ret["nElems"] ) )
+    return( results )
+
+
+# ========================================================= #
+# ===  build & mesh the pole in one mode                === #
+# ========================================================= #
+
+def run__poleMode( queue, mode, const, meshsize ):
+
+    import generate__poleLayer as gpl
+    gmsh.initialize()
+    gmsh.option.setNumber( "General.Terminal", 0 )
+    gmsh.option.setNumber( "Mesh.CharacteristicLengthMin", meshsize )
+    gmsh.option.setNumber( "Mesh.CharacteristicLengthMax", meshsize )
+    gmsh.model.add( "model" )
+    # -- modeling -- #
+    time1 = time.perf_counter()
+    gpl.generate__poleLayer( side=const["geometry.side"], z1=const["geometry.z_pole"], \
+                             z2=const["geometry.z_root"], radius=const["geometry.r_pole"], \
+                             mode=mode )
+    time2 = time.perf_counter()
+    # -- meshing  -- #
+    gmsh.model.mesh.generate(3)
+    time3 = time.perf_counter()
+    nodeTags     = gmsh.model.mesh.getNodes()[0]
+    elemTags     = gmsh.model.mesh.getElements( dim=3 )[1]
+    ret = { "mode":mode, "t_model":time2-time1, "t_mesh":time3-time2, \
+            "peakRSS":resource.getrusage( resource.RUSAGE_SELF ).ru_maxrss / 1024.0, \
+            "nNodes":len( nodeTags ), "nElems":int( sum( [ len( tags ) for tags in elemTags ] ) ) }
+    gmsh.finalize()
+    queue.put( ret )
+
+
+# ========================================================= #
+# ===   実行部                                          === #
+# ========================================================= #
+if ( __name__=="__main__" ):
+    benchmark__poleMode()
@@ -0,0 +1,198 @@
+import os, sys
+import numpy as np
+import gmsh
+
+
+# ========================================================= #
+# ===  topology snapshot of the synchronized model      === #
+# ========================================================= #
+#  -- entities of dim. d are rows 0..n-1 of tags[d] ( sorted )     --  #
+#  -- down[d]  :: CSR ( indptr, indices ) rows(d) -> rows(d-1)      --  #
+#  -- phys[d]  :: CSR ( physNums, indptr, indices ) group -> rows(d) --  #
+
+def build__topology():
+
+    # ------------------------------------------------- #
+    # --- [1] entities                              --- #
+    # ------------------------------------------------- #
+    topo    = { "tags":{}, "down":{}, "phys":{} }
+    for dim in range(4):
+        tags              = [ tag for edim,tag in gmsh.model.getEntities( dim ) ]
+        topo["tags"][dim] = np.array( sorted( tags ), dtype=np.int64 )
+
+    # ------------------------------------------------- #
+    # --- [2] downward adjacency ( one call / entity ) - #
+    # ------------------------------------------------- #
+    for dim in [1,2,3]:
+        indptr, indices = [0], []
+        for tag in topo["tags"][dim]:
+            bounds  = gmsh.model.getBoundary( [(dim,int(tag))], combined=False, oriented=False )
+            bounds  = np.unique( [ abs( btag ) for bdim,btag in bounds ] )
+            indices.append( row__ofTags( topo, dim-1, bounds ) )
+            indptr .append( indptr[-1] + len( bounds ) )
+        indices   = np.concatenate( indices ) if ( len( indices ) > 0 ) else np.zeros( (0,) )
+        topo["down"][dim] = ( np.array( indptr, dtype=np.int64 ), np.array( indices, dtype=np.int64 ) )
+
+    # ------------------------------------------------- #
+    # --- [3] physical groups                       --- #
+    # ------------------------------------------------- #
+    for dim in range(4):
+        physNums, indptr, indices = [], [0], []
+        for pdim,physNum in gmsh.model.getPhysicalGroups( dim ):
+            ents    = gmsh.model.getEntitiesForPhysicalGroup( dim, physNum )
+            physNums.append( physNum )
+            indices .append( row__ofTags( topo, dim, ents ) )
+            indptr  .append( indptr[-1] + len( ents ) )
+        indices   = np.concatenate( indices ) if ( len( indices ) > 0 ) else np.zeros( (0,) )
+        topo["phys"][dim] = ( np.array( physNums, dtype=np.int64 ), \
+                              np.array( indptr  , dtype=np.int64 ), np.array( indices, dtype=np.int64 ) )
+    return( topo )
+
+
+# ========================================================= #
+# ===  tag <-> row                                      === #
+# ========================================================= #
+
+def row__ofTags( topo=None, dim=3, tags=None ):
+    return( np.searchsorted( topo["tags"][dim], np.array( tags, dtype=np.int64 ) ) )
+
+def tag__ofRows( topo=None, dim=3, rows=None ):
+    return( topo["tags"][dim][ np.array( rows, dtype=np.int64 ) ] )
+
+
+# ========================================================= #
+# ===  gather CSR rows ( vectorized )                   === #
+# ========================================================= #
+
+def gather__csr( indptr=None, indices=None, rows=None ):
+
+    #  -- returns ( concatenated indices, count per row ) --  #
+    rows    = np.array( rows, dtype=np.int64 )
+    starts  = indptr[rows]
+    counts  = indptr[rows+1] - starts
+    offsets = np.repeat( starts - ( np.cumsum( counts ) - counts ), counts ) \
+        + np.arange( np.sum( counts ) )
+    return( indices[offsets], counts )
+
+
+# ========================================================= #
+# ===  entities of physical group                       === #
+# ========================================================= #
+
+def rows__ofPhysical( topo=None, dim=3, physNum=None ):
+
+    physNums, indptr, indices = topo["phys"][dim]
+    hit     = np.where( physNums == physNum )[0]
+    if ( len( hit ) == 0 ):
+        return( np.zeros( (0,), dtype=np.int64 ) )
+    return( gather__csr( indptr, indices, hit )[0] )
+
+
+# ========================================================= #
+# ===  boundary of a set of entities                    === #
+# ========================================================= #
+
+def boundary__ofRows( topo=None, dim=3, rows=None, combined=True ):
+
+    #  -- combined :: entities shared by two of the rows are dropped --  #
+    bounds, counts = gather__csr( *topo["down"][dim], rows )
+    if ( combined ):
+        uniq, num  = np.unique( bounds, return_counts=True )
+        return( uniq[ num == 1 ] )
+    return( np.unique( bounds ) )
+
+
+# ========================================================= #
+# ===  closure down to lower dimension                  === #
+# ========================================================= #
+
+def closure__ofRows( topo=None, dim=3, rows=None, toDim=1 ):
+    rows    = np.unique( np.array( rows, dtype=np.int64 ) )
+    for idim in range( dim, toDim, -1 ):
+        rows = np.unique( gather__csr( *topo["down"][idim], rows )[0] )
+    return( rows )
+
+
+# ========================================================= #
+# ===  common boundary of two physical groups           === #
+# ========================================================= #
+
+def common__boundary( topo=None, physNum1=None, physNum2=None, dim=3 ):
+
+    #  -- e.g. surfaces between gap (301) and poleTip (302) --  #
+    bound1  = boundary__ofRows( topo, dim, rows__ofPhysical( topo, dim, physNum1 ) )
+    bound2  = boundary__ofRows( topo, dim, rows__ofPhysical( topo, dim, physNum2 ) )
+    return( tag__ofRows( topo, dim-1, np.intersect1d( bound1, bound2 ) ) )
+
+
+# ========================================================= #
+# ===  volumes meshable as transfinite hexa / prism     === #
+# ========================================================= #
+
+def select__hexCandidates( topo=None, rows=None ):
+
+    # ------------------------------------------------- #
+    # --- [1] face / edge counts ( vectorized )     --- #
+    # ------------------------------------------------- #
+    #  -- hexa  :: 6 faces of 4 edges                --  #
+    #  -- prism :: 5 faces, 2 of 3 edges & 3 of 4     --  #
+    #  -- rows  :: volume rows ( default: all volumes ) -> candidate rows --  #
+    if ( rows is None ):
+        rows    = np.arange( topo["tags"][3].shape[0] )
+    rows        = np.array( rows, dtype=np.int64 )
+    if ( rows.shape[0] == 0 ):
+        return( rows )
+    faces, nFaces = gather__csr( *topo["down"][3], rows )
+    nEdges        = np.diff( topo["down"][2][0] )[faces]
+    owner         = np.repeat( np.arange( rows.shape[0] ), nFaces )
+    minPerVolu    = np.full ( rows.shape[0], np.iinfo( np.int64 ).max, dtype=np.int64 )
+    maxPerVolu    = np.zeros( rows.shape[0], dtype=np.int64 )
+    nTriangles    = np.zeros( rows.shape[0], dtype=np.int64 )
+    np.minimum.at( minPerVolu, owner, nEdges )
+    np.maximum.at( maxPerVolu, owner, nEdges )
+    np.add.at    ( nTriangles, owner, ( nEdges == 3 ).astype( np.int64 ) )
+    shaped        = ( nFaces >= 5 ) & ( nFaces <= 6 ) & ( minPerVolu >= 3 ) & ( maxPerVolu <= 4 ) \
+        & ( nTriangles == np.where( nFaces == 5, 2, 0 ) )
+
+    # ------------------------------------------------- #
+    # --- [2] corners & opposite-edge classes       --- #
+    # ------------------------------------------------- #
+    #  -- e.g. a half-cylinder ( 4 faces, 2-edge half disks ) is left to tetra --  #
+    rows        = rows[shaped]
+    ok          = np.array( [ check__hexTopology( topo, row ) for row in rows ], dtype=bool )
+    return( rows[ok] if ( rows.shape[0] > 0 ) else rows )
+
+
+def check__hexTopology( topo=None, row=None ):
+
+    # ------------------------------------------------- #
+    # --- [1] number of edges & corners             --- #
+    # ------------------------------------------------- #
+    faces   = gather__csr( *topo["down"][3], [row] )[0]
+    edges   = np.unique( gather__csr( *topo["down"][2], faces )[0] )
+    points  = np.unique( gather__csr( *topo["down"][1], edges )[0] )
+    hexa    = ( faces.shape[0] == 6 )
+    if ( ( edges.shape[0], points.shape[0] ) != ( ( 12, 8 ) if hexa else ( 9, 6 ) ) ):
+        return( False )
+
+    # ------------------------------------------------- #
+    # --- [2] classes of opposite edges on quads    --- #
+    # ------------------------------------------------- #
+    #  -- hexa :: 3 classes of 4 edges,  prism :: 3 classes of 2 & one of 3 --  #
+    ends    = { edge:set( gather__csr( *topo["down"][1], [edge] )[0] ) for edge in edges }
+    label   = { edge:edge for edge in edges }
+    def root( edge ):
+        while ( label[edge] != edge ):
+            edge = label[edge]
+        return( edge )
+    for face in faces:
+        quad    = gather__csr( *topo["down"][2], [face] )[0]
+        if ( quad.shape[0] != 4 ):
+            continue
+        for i1 in range( 4 ):
+            for i2 in range( i1+1, 4 ):
+                if ( len( ends[quad[i1]] & ends[quad[i2]] ) == 0 ):
+                    r1, r2     = root( quad[i1] ), root( quad[i2] )
+                    label[max( r1, r2 )] = min( r1, r2 )
+    sizes   = sorted( np.unique( [ root( edge ) for edge in edges ], return_counts=True )[1] )
+    return( sizes == ( [4,4,4] if hexa else [2,2,2,3] ) )
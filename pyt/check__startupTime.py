@@ -0,0 +1,56 @@
+import os, sys, subprocess
+
+
+# ========================================================= #
+# ===  measure start-up ( import ) time of the drivers  === #
+# ========================================================= #
+
+def check__startupTime( modules=None, budget=None, nTrial=5, inpDir="dat" ):
+
+    # ------------------------------------------------- #
+    # --- [1] budget from config                    --- #
+    # ------------------------------------------------- #
+    #  -- plotting is off :: no matplotlib may be loaded at import --  #
+    if ( modules is None ):
+        modules = [ "make__poleSurface", "make__magnet" ]
+    if ( budget  is None ):
+        import nkUtilities.load__constants as lcn
+        const   = lcn.load__constants( inpFile=os.path.join( inpDir, "parameter.conf" ) )
+        budget  = const["run.startup_budget"]
+
+    # ------------------------------------------------- #
+    # --- [2] import in a fresh interpreter         --- #
+    # ------------------------------------------------- #
+    #  -- minimum of nTrial runs ( cold caches excluded ) --  #
+    pyDir   = os.path.dirname( os.path.abspath( __file__ ) )
+    script  = "import sys, time; t=time.perf_counter(); import {0}; " \
+              "print( time.perf_counter()-t, int( 'matplotlib' in sys.modules ) )"
+    results = {}
+    for module in modules:
+        times, plots = [], 0
+        for ik in range( nTrial ):
+            out   = subprocess.run( [ sys.executable, "-c", script.format( module ) ], cwd=pyDir, \
+                                    capture_output=True, text=True, check=True ).stdout.split()
+            times.append( float( out[-2] ) )
+            plots = max( plots, int( out[-1] ) )
+        results[module] = { "time":min( times ), "matplotlib":bool( plots ), \
+                            "pass":( min( times ) <= budget ) and not( plots ) }
+
+    # ------------------------------------------------- #
+    # --- [3] display                               --- #
+    # ------------------------------------------------- #
+    fmt     = "{0:<24} {1:>10} {2:>10} {3:>12} {4:>6}"
+    print( fmt.format( "# module", "time[s]", "budget[s]", "matplotlib", "pass" ) )
+    for module,ret in results.items():
+        print( fmt.format( module, "{0:.3f}".format( ret["time"] ), "{0:.3f}".format( budget ), \
+                           str( ret["matplotlib"] ), str( ret["pass"] ) ) )
+    return( results )
+
+
+# ========================================================= #
+# ===   実行部                                          === #
+# ========================================================= #
+if ( __name__=="__main__" ):
+    results = check__startupTime()
+    if ( not( all( [ ret["pass"] for ret in results.values() ] ) ) ):
+        sys.exit( "[check__startupTime] start-up budget exceeded !!! " )
@@ -14,34 +14,172 @@ def define__ports( inpFile="dat/ports.conf" ):
     # ------------------------------------------------- #
     import nkUtilities.load__table2dictarr as ltd
     params = ltd.load__table2dictarr( inpFile=inpFile )
-    
+    if ( len( params ) == 0 ):
+        return( [] )
+
+    # ------------------------------------------------- #
+    # --- [2] placement of all ports ( batched )    --- #
     # ------------------------------------------------- #
-    # --- [2] make ports                            --- #
+    #  -- rotation about z by theta, then translation to r_pos ( + dx,dy,dz ) --  #
+    get        = lambda key: np.array( [ float( param[key] ) for param in params ] )
+    ptheta     = get( "theta" ) / 180.0 * np.pi
+    cos, sin   = np.cos( ptheta ), np.sin( ptheta )
+    trans      = np.stack( [ get( "r_pos" )*cos + get( "dx" ), \
+                             get( "r_pos" )*sin + get( "dy" ), get( "dz" ) ], axis=1 )
+    affine     = np.zeros( ( len( params ), 12 ) )
+    affine[:,[0,1,3]]  = np.stack( [ cos, -sin, trans[:,0] ], axis=1 )
+    affine[:,[4,5,7]]  = np.stack( [ sin,  cos, trans[:,1] ], axis=1 )
+    affine[:,[10,11] ] = np.stack( [ np.ones_like( cos ), trans[:,2] ], axis=1 )
+
     # ------------------------------------------------- #
+    # --- [3] make ports                            --- #
+    # ------------------------------------------------- #
+    #  -- pipe / cone are made in place, only boxes are transformed --  #
     nums   = []
-    for param in params:
-        #  -- [2-1] object type    --  #
-        if ( param["type"].lower() == "pipe" ):
-            ret = gmsh.model.occ.addCylinder( 0.0, 0.0, -0.5*param["wz"], \
+    for ik,param in enumerate( params ):
+        ptype      = param["type"].lower()
+        tx, ty, tz = trans[ik]
+        if   ( ptype == "pipe" ):
+            ret = gmsh.model.occ.addCylinder( tx, ty, tz-0.5*param["wz"], \
                                               0.0, 0.0, +1.0*param["wz"], param["r1"] )
-        if ( param["type"].lower() == "cone" ):
-            ret = gmsh.model.occ.addCOne    ( -0.5*param["wx"], 0.0, 0.0, \
-                                              +1.0*param["wx"], 0.0, 0.0, param["r1"], param["r2"] )
-        if ( param["type"].lower() == "cube" ):
+        elif ( ptype == "cone" ):
+            ret = gmsh.model.occ.addCone    ( tx-0.5*param["wx"]*cos[ik], ty-0.5*param["wx"]*sin[ik], tz, \
+                                              param["wx"]*cos[ik], param["wx"]*sin[ik], 0.0, \
+                                              param["r1"], param["r2"] )
+        elif ( ptype == "cube" ):
             ret = gmsh.model.occ.addBox     ( -0.5*param["wx"], -0.5*param["wy"], -0.5*param["wz"], \
                                               +1.0*param["wx"], +1.0*param["wy"], +1.0*param["wz"], )
-        #  -- [2-2] rotate object  --  #
-        ptheta     = param["theta"] / 180.0 * np.pi
-        gmsh.model.occ.rotate( [(3,ret)], 0,0,0, 0,0,1, ptheta )
-        #  -- [2-3] translate      --  #
-        dx, dy, dz = param["r_pos"]*np.cos( ptheta ), param["r_pos"]*np.sin( ptheta ), 0.0
-        dx, dy, dz = dx+param["dx"], dy+param["dy"], dz+param["dz"]
-        gmsh.model.occ.translate( [(3,ret)], dx, dy, dz )
-        #  -- [2-4] append number  --  #
+            gmsh.model.occ.affineTransform( [(3,ret)], list( affine[ik] ) )
+        else:
+            sys.exit( "[define__ports] type == {0} ??? ( pipe, cone, cube ) ".format( param["type"] ) )
         nums.append( ret )
     return( nums )
 
 
+# ========================================================= #
+# ===  cut ports from targets ( single fragment )       === #
+# ========================================================= #
+
+def cut__ports( targets=None, tools=None ):
+
+    # ------------------------------------------------- #
+    # --- [1] fragment targets by all ports at once --- #
+    # ------------------------------------------------- #
+    #  -- outMap[i] :: pieces of inputs[i] ( targets, then tools ) --  #
+    targets     = [ (3,int( target )) for target in targets ]
+    tools       = [ (3,int( tool   )) for tool   in tools   ]
+    if ( len( targets ) == 0 ):
+        gmsh.model.occ.remove( tools, recursive=True )
+        return( { "yoke":[], "holes":[], "pieces":{} } )
+    out, outMap = gmsh.model.occ.fragment( targets, tools )
+    tgt_pieces  = set( [ tag for dimtags in outMap[:len(targets)] for dim,tag in dimtags ] )
+    tol_pieces  = set( [ tag for dimtags in outMap[len(targets):] for dim,tag in dimtags ] )
+
+    # ------------------------------------------------- #
+    # --- [2] classify pieces                       --- #
+    # ------------------------------------------------- #
+    #  -- target only :: cut target,  both :: hole,  tool only :: removed --  #
+    #  -- pieces      :: input target tag -> its cut pieces ( names carried ) --  #
+    yoke        = sorted( tgt_pieces - tol_pieces )
+    holes       = sorted( tgt_pieces & tol_pieces )
+    outside     = sorted( tol_pieces - tgt_pieces )
+    pieces      = { target:[ tag for dim,tag in dimtags if ( tag in yoke ) ] \
+                    for (tdim,target),dimtags in zip( targets, outMap ) }
+    if ( len( outside ) > 0 ):
+        gmsh.model.occ.remove( [ (3,tag) for tag in outside ], recursive=True )
+    ret         = { "yoke":yoke, "holes":holes, "pieces":pieces }
+    return( ret )
+
+
+# ========================================================= #
+# ===  volumes touched by ports ( bounding box query )  === #
+# ========================================================= #
+
+def find__portTargets( tools=None, mapping=None, select="auto", fallback=None, tolerance=1.e-6 ):
+
+    # ------------------------------------------------- #
+    # --- [1] candidates                            --- #
+    # ------------------------------------------------- #
+    #  -- select   :: auto ( all volumes ), or part-name prefix ( e.g. yoke ) --  #
+    #  -- fallback :: target tags if no part names exist ( yoke_tobecut )    --  #
+    tools       = [ int( tool ) for tool in tools ]
+    volumes     = [ tag for dim,tag in gmsh.model.occ.getEntities( 3 ) if not( tag in tools ) ]
+    if ( select != "auto" ):
+        if   ( not( mapping ) and ( fallback is not None ) ):
+            print( "[find__portTargets] no part names ( select == {0} ), targets :: {1}".format( select, fallback ) )
+            return( [ int( tag ) for tag in fallback ] )
+        elif ( not( mapping ) ):
+            sys.exit( "[find__portTargets] no part names for select == {0} ??? ".format( select ) )
+        named   = set( [ tag for name,tags in mapping.items() if name.startswith( select ) for tag in tags ] )
+        if ( len( named ) == 0 ):
+            sys.exit( "[find__portTargets] no part named {0}* in {1} ??? ".format( select, list( mapping.keys() ) ) )
+        volumes = [ tag for tag in volumes if ( tag in named ) ]
+    if ( ( len( volumes ) == 0 ) or ( len( tools ) == 0 ) ):
+        return( [] )
+
+    # ------------------------------------------------- #
+    # --- [2] bounding boxes, taken once            --- #
+    # ------------------------------------------------- #
+    #  -- bbox :: ( xmin, ymin, zmin, xmax, ymax, zmax ) --  #
+    vbox        = np.array( [ gmsh.model.occ.getBoundingBox( 3, tag ) for tag in volumes ] )
+    pbox        = np.array( [ gmsh.model.occ.getBoundingBox( 3, tag ) for tag in tools   ] )
+
+    # ------------------------------------------------- #
+    # --- [3] overlap of every ( volume, port ) pair --- #
+    # ------------------------------------------------- #
+    overlap     = np.all( ( vbox[:,None,:3] <= pbox[None,:,3:] + tolerance ) & \
+                          ( pbox[None,:,:3] <= vbox[:,None,3:] + tolerance ), axis=2 )
+    targets     = [ volumes[ik] for ik in np.where( np.any( overlap, axis=1 ) )[0] ]
+    print( "[find__portTargets] {0} / {1} volumes overlap ports :: {2}".format( len( targets ), \
+                                                                             len( volumes ), targets ) )
+    return( targets )
+
+
+# ========================================================= #
+# ===  cache of the port-free model                     === #
+# ========================================================= #
+
+def key__portFree( const=None, inpDir="dat" ):
+
+    #  -- geometry keys but the port stage's ( + recombine ), and the pole input data --  #
+    import hashlib
+    import manage__pointData as mpd
+    sha     = hashlib.sha256()
+    ignore  = [ "geometry.add_port", "geometry.yoke_tobecut", "geometry.port_cache", \
+                "geometry.port_targets", "geometry.port_region" ]
+    items   = sorted( [ ( key, repr( val ) ) for key,val in const.items() \
+                        if ( ( key.startswith( "geometry." ) and not( key in ignore ) ) \
+                             or ( key == "mesh.recombine" ) ) ] )
+    sha.update( repr( items ).encode() )
+    if ( not( const["geometry.flat_pole"] ) ):
+        for name in [ "onmesh_right.dat", "onmesh_left.dat", \
+                      "mesh_right.elements", "mesh_left.elements" ]:
+            inpFile = os.path.join( inpDir, name )
+            inpFile = mpd.binaryFile( inpFile ) if mpd.use__binary( inpFile ) else inpFile
+            if ( os.path.exists( inpFile ) ):
+                with open( inpFile, "rb" ) as f:
+                    sha.update( f.read() )
+    return( sha.hexdigest() )
+
+def lookup__portFree( key=None, stpFile="msh/model_woport.step" ):
+    sigFile = stpFile + ".key"
+    if ( not( os.path.exists( stpFile ) and os.path.exists( sigFile ) ) ):
+        return( None )
+    with open( sigFile, "r" ) as f:
+        if ( f.read().strip() != key ):
+            return( None )
+    print( "[lookup__portFree] reuse port-free model :: {0}".format( stpFile ) )
+    return( stpFile )
+
+def store__portFree( key=None, stpFile="msh/model_woport.step", mapping=None ):
+    import assemble__parts as apt
+    gmsh.write( stpFile )
+    if ( mapping ):
+        apt.write__signatures( apt.sign__mapping( mapping ), stpFile + ".parts" )
+    with open( stpFile + ".key", "w" ) as f:
+        f.write( key + "\n" )
+    return( stpFile )
+
 
 # ========================================================= #
 # ===   実行部                                          === #
@@ -54,11 +192,11 @@ if ( __name__=="__main__" ):
 
     portFile = "dat/ports.conf"
     define__ports( inpFile=portFile )
-    
+
     gmsh.model.occ.synchronize()
     gmsh.option.setNumber( "Mesh.CharacteristicLengthMin", 0.1 )
     gmsh.option.setNumber( "Mesh.CharacteristicLengthMax", 0.1 )
     gmsh.model.mesh.generate(3)
     gmsh.write( "msh/ports.msh" )
     gmsh.finalize()
-    
+
@@ -0,0 +1,176 @@
+import numpy as np
+import os, sys
+import gmsh
+
+
+# ========================================================= #
+# ===  generate pole parts as discrete entities         === #
+# ========================================================= #
+#  -- pole-only model ( benchmark of the pole face ) :: the walls, floor and   --  #
+#  -- ceiling are its own discrete surfaces, not the sector surfaces of the    --  #
+#  -- full magnet, since discrete entities take no part in OCC fragments       --  #
+
+def generate__discretePole( lc=None, side="+", z1=0.7, z2=1.0, radius=1.0, \
+                            physNums=[301,302,303], physNames=["gap","poleTip","poleBody"], \
+                            inpDir="dat" ):
+
+    # ------------------------------------------------- #
+    # --- [1] preparation                           --- #
+    # ------------------------------------------------- #
+    #  -- [1-1] constants                           --  #
+    eps               = 1.e-8
+    x_,y_,z_          = 0, 1, 2
+    surfDim, voluDim  = 2, 3
+
+    #  -- [1-2] load point Data                     --  #
+    if   ( side == "+" ):
+        nodFile = os.path.join( inpDir, "onmesh_right.dat" )
+        mshFile = os.path.join( inpDir, "mesh_right.elements" )
+    elif ( side == "-" ):
+        nodFile = os.path.join( inpDir, "onmesh_left.dat"  )
+        mshFile = os.path.join( inpDir, "mesh_left.elements"  )
+    else:
+        print( "[generate__discretePole] side == {0} ??? ERROR! ".format( side ) )
+        sys.exit()
+    import manage__pointData as mpd
+    pointData         = mpd.load__pointData( inpFile=nodFile, returnType="point" )
+
+    #  -- [1-3] load connectivities                 --  #
+    connectivities    = mpd.load__elementData( inpFile=mshFile )
+    connectivities    = np.array( connectivities[:,3:], dtype=np.int64 )
+    connectivities    = connectivities - 1
+
+    # ------------------------------------------------- #
+    # --- [2] boundary chains of the pole mesh      --- #
+    # ------------------------------------------------- #
+    #  -- [2-1] onArc nodes ( sorted along y )      --  #
+    radii             = np.sqrt( pointData[:,x_]**2 + pointData[:,y_]**2 )
+    arc_nodes         = np.where( np.abs( radii - radius ) < eps )[0]
+    arc_nodes         = arc_nodes[ np.argsort( pointData[arc_nodes,y_] ) ]
+    #  -- [2-2] on diameter nodes ( sorted along y )--  #
+    dia_nodes         = np.where( np.abs( pointData[:,x_] ) < eps )[0]
+    dia_nodes         = dia_nodes[ np.argsort( pointData[dia_nodes,y_] ) ]
+    #  -- [2-3] common number of layers of walls   --  #
+    if ( lc is None ):
+        lc = np.mean( np.linalg.norm( np.diff( pointData[arc_nodes,0:2], axis=0 ), axis=1 ) )
+    z_face            = pointData[:,z_]
+    heights           = [ np.max( z_face ), np.max( z1 - z_face ), z2 - z1 ]
+    nLayers           = [ max( 1, int( np.ceil( h / lc ) ) ) for h in heights ]
+
+    # ------------------------------------------------- #
+    # --- [3] discrete surfaces ( triangulation )   --- #
+    # ------------------------------------------------- #
+    #  -- pole face / floor / ceiling / root top are the same 2D mesh  -- #
+    nodes, surfs = [], {}
+    def add__surface( name, coord, tris ):
+        offset      = sum( [ node.shape[0] for node in nodes ] )
+        nodes.append( coord )
+        surfs[name] = tris + offset
+    zeros = np.zeros_like( z_face )
+    add__surface( "face"   , levelCoord( pointData, z_face  ), connectivities )
+    add__surface( "floor"  , levelCoord( pointData, zeros   ), connectivities )
+    add__surface( "ceiling", levelCoord( pointData, zeros+z1 ), connectivities )
+    add__surface( "top"    , levelCoord( pointData, zeros+z2 ), connectivities )
+    #  -- side walls along arc & diameter         -- #
+    for chain,key in [ (arc_nodes,"side"), (dia_nodes,"dia") ]:
+        xy, zf = pointData[chain,0:2], z_face[chain]
+        zb, zc = np.zeros_like( zf ), np.zeros_like( zf ) + z1
+        zt     = np.zeros_like( zf ) + z2
+        bands  = [ ("_lower",zb,zf), ("_upper",zf,zc), ("_root",zc,zt) ]
+        for (name,zlo,zhi),nLayer in zip( bands, nLayers ):
+            coord, tris = build__wallStrip( xy=xy, z_lower=zlo, z_upper=zhi, nLayer=nLayer )
+            add__surface( key+name, coord, tris )
+
+    # ------------------------------------------------- #
+    # --- [4] merge coincident nodes                --- #
+    # ------------------------------------------------- #
+    nodes          = np.concatenate( nodes, axis=0 )
+    qkeys          = np.round( nodes / eps ).astype( np.int64 )
+    uniq, index, inverse = np.unique( qkeys, axis=0, return_index=True, return_inverse=True )
+    inverse        = np.reshape( inverse, (-1,) )
+    nodes          = nodes[index]
+    for name in surfs.keys():
+        tris        = inverse[ surfs[name] ]
+        degenerate  = ( tris[:,0] == tris[:,1] ) | ( tris[:,1] == tris[:,2] ) | \
+                      ( tris[:,2] == tris[:,0] )
+        surfs[name] = tris[ np.logical_not( degenerate ) ]
+    #  -- facets repeated in later surfaces ( pole face lying on the floor ) :: keep the face's --  #
+    nNode          = nodes.shape[0]
+    seen           = np.zeros( ( 0, ), dtype=np.int64 )
+    for name in surfs.keys():
+        fkeys       = np.sort( surfs[name], axis=1 )
+        fkeys       = ( fkeys[:,0]*nNode + fkeys[:,1] )*nNode + fkeys[:,2]
+        repeated    = np.isin( fkeys, seen )
+        surfs[name] = surfs[name][ np.logical_not( repeated ) ]
+        seen        = np.concatenate( [ seen, fkeys[ np.logical_not( repeated ) ] ] )
+
+    # ------------------------------------------------- #
+    # --- [5] inject discrete surfaces into gmsh    --- #
+    # ------------------------------------------------- #
+    owned     = np.zeros( ( nodes.shape[0], ), dtype=bool )
+    s_tags    = {}
+    for name,tris in surfs.items():
+        s_tags[name] = gmsh.model.addDiscreteEntity( surfDim )
+        news         = np.unique( tris )
+        news         = news[ np.logical_not( owned[news] ) ]
+        owned[news]  = True
+        gmsh.model.mesh.addNodes( surfDim, s_tags[name], news+1, np.ravel( nodes[news] ) )
+        gmsh.model.mesh.addElementsByType( s_tags[name], 2, [], np.ravel( tris+1 ) )
+
+    # ------------------------------------------------- #
+    # --- [6] discrete volumes & physical groups    --- #
+    # ------------------------------------------------- #
+    loops     = [ [ "floor"  , "side_lower", "dia_lower", "face"    ], \
+                  [ "face"   , "side_upper", "dia_upper", "ceiling" ], \
+                  [ "ceiling", "side_root" , "dia_root" , "top"     ] ]
+    #  -- volumes bounded by the discrete surfaces ( geo loop ), meshable by generate(3) --  #
+    #  -- ret :: { region name : [ volume tag ] } as the occ mode                        --  #
+    ret       = {}
+    for loop,physNum,physName in zip( loops, physNums, physNames ):
+        s_loop = gmsh.model.geo.addSurfaceLoop( [ s_tags[key] for key in loop ] )
+        v_tag  = gmsh.model.geo.addVolume( [ s_loop ] )
+        gmsh.model.geo.synchronize()
+        gmsh.model.addPhysicalGroup( voluDim, [v_tag], physNum )
+        gmsh.model.setPhysicalName ( voluDim, physNum, physName )
+        ret[physName] = [ v_tag ]
+    return( ret )
+
+
+# ========================================================= #
+# ===  node coordinates of the mesh at given height     === #
+# ========================================================= #
+
+def levelCoord( pointData=None, zpos=None ):
+    ret       = np.copy( pointData[:,0:3] )
+    ret[:,2]  = zpos
+    return( ret )
+
+
+# ========================================================= #
+# ===  triangulated wall between two polylines          === #
+# ========================================================= #
+
+def build__wallStrip( xy=None, z_lower=None, z_upper=None, nLayer=1 ):
+
+    # ------------------------------------------------- #
+    # --- [1] nodes of each layer                   --- #
+    # ------------------------------------------------- #
+    nChain   = xy.shape[0]
+    ratio    = np.linspace( 0.0, 1.0, nLayer+1 )
+    zpos     = z_lower[None,:] + ( z_upper - z_lower )[None,:] * ratio[:,None]
+    coord    = np.zeros( ( nLayer+1, nChain, 3 ) )
+    coord[...,0:2] = xy[None,:,:]
+    coord[...,  2] = zpos
+    coord    = np.reshape( coord, (-1,3) )
+
+    # ------------------------------------------------- #
+    # --- [2] two triangles per quad                --- #
+    # ------------------------------------------------- #
+    ik, ic   = np.meshgrid( np.arange( nLayer ), np.arange( nChain-1 ), indexing="ij" )
+    n1       = np.ravel( (ik  )*nChain + ic   )
+    n2       = np.ravel( (ik  )*nChain + ic+1 )
+    n3       = np.ravel( (ik+1)*nChain + ic+1 )
+    n4       = np.ravel( (ik+1)*nChain + ic   )
+    tris     = np.concatenate( [ np.stack( [n1,n2,n3], axis=1 ), \
+                                 np.stack( [n1,n3,n4], axis=1 ) ], axis=0 )
+    return( coord, tris )
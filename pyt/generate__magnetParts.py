@@ -1,21 +1,28 @@
-import os, sys, subprocess
+import os, sys
 import gmsh
 import numpy                              as np
 import nkGmshRoutines.generate__coneShape as con
 import nkGmshRoutines.generate__sector180 as sec
+import assemble__parts                    as apt
 
 
 # ========================================================= #
 # === generate magnet shape                             === #
 # ========================================================= #
 
-def generate__magnetParts( side="+" ):
+def generate__magnetParts( side="+", const=None, inpDir="dat", outDir="msh" ):
 
-    cnsFile    = "dat/parameter.conf"
-    import nkUtilities.load__constants as lcn
-    const      = lcn.load__constants( inpFile=cnsFile )
+    if ( const is None ):
+        cnsFile    = os.path.join( inpDir, "parameter.conf" )
+        import nkUtilities.load__constants as lcn
+        const      = lcn.load__constants( inpFile=cnsFile )
 
     hexahedral = const["mesh.recombine"]
+    #  -- fragment :: no intermediate dedup, parts are recorded for one final fragment --  #
+    #  -- parts      :: [ ( "<region>_<side>", [tags] ) ], region = key of mesh.conf   --  #
+    dedup      = ( const["geometry.assembly"] == "dedup" )
+    parts      = []
+    names      = { "+":"right", "-":"left" }
     
     r_pole     = const["geometry.r_pole"]
     w_iair1    = const["geometry.w_iair1"]
@@ -44,11 +51,11 @@ def generate__magnetParts( side="+" ):
     # ------------------------------------------------- #
     if ( const["geometry.flat_pole"] ):
         if   ( side == "+" ):
-            generate__pole( r1=0.0, r2=r_pole, z1=0.0, z2=z_gap, z3=z_pole, z4=z_root, \
+            regions = generate__pole( r1=0.0, r2=r_pole, z1=0.0, z2=z_gap, z3=z_pole, z4=z_root, \
                             side="+", hexahedral=hexahedral )
             
         elif ( side == "-" ):
-            generate__pole( r1=0.0, r2=r_pole, z1=0.0, z2=z_gap, z3=z_pole, z4=z_root, \
+            regions = generate__pole( r1=0.0, r2=r_pole, z1=0.0, z2=z_gap, z3=z_pole, z4=z_root, \
                             side="-", hexahedral=hexahedral )
 
         elif ( side in ["+-","-+"] ):
@@ -60,29 +67,69 @@ def generate__magnetParts( side="+" ):
 
         import generate__poleLayer as gpl
         if   ( side == "+" ):
-            gpl.generate__poleLayer( side="+", z1=z_pole, z2=z_root, radius=r_pole )
+            regions = gpl.generate__poleLayer( side="+", z1=z_pole, z2=z_root, radius=r_pole, inpDir=inpDir, \
+                                               dedup=dedup )
 
         elif ( side == "-" ):
-            gpl.generate__poleLayer( side="-", z1=z_pole, z2=z_root, radius=r_pole )
+            regions = gpl.generate__poleLayer( side="-", z1=z_pole, z2=z_root, radius=r_pole, inpDir=inpDir, \
+                                               dedup=dedup )
 
         elif ( side in ["+-","-+"] ):
-            # -- generate (+) side and save it -- #
-            gmsh.model.add( "pole_right" )
-            gpl.generate__poleLayer( side="+" , z1=z_pole, z2=z_root, radius=r_pole )
-            gmsh.write( "msh/pole_right.step" )
-            gmsh.model.remove()
-            # -- generate (+) side and save it -- #
-            gmsh.model.add( "pole_left" )
-            gpl.generate__poleLayer( side="-" , z1=z_pole, z2=z_root, radius=r_pole )
-            gmsh.write( "msh/pole_left.step" )
-            gmsh.model.remove()
-            # -- load each model again         -- #
+            # -- generate each side and save it ( or reuse cache ) -- #
+            import manage__poleCache as mpc
+            stpFiles, builds = [], []
+            cacheDir = const.get( "geometry.pole_cache_dir", os.path.join( outDir, "cache" ) )
+            for pside,name in [ ("+","pole_right"), ("-","pole_left") ]:
+                stpFile  = os.path.join( outDir, "{0}.step".format( name ) )
+                key, cached = None, None
+                if ( const["geometry.pole_cache"] ):
+                    key    = mpc.key__poleCache( side=pside, r_pole=r_pole, \
+                                                 z_pole=z_pole, z_root=z_root, inpDir=inpDir )
+                    cached = mpc.lookup__poleCache( key=key, cacheDir=cacheDir )
+                if ( cached is None ):
+                    builds.append( { "side":pside, "name":name, "stpFile":stpFile, "key":key } )
+                    stpFiles.append( stpFile )
+                else:
+                    stpFiles.append( cached  )
+            # -- build missing sides ( each in own process if parallel ) -- #
+            if ( const["run.parallel"] and ( len( builds ) > 1 ) ):
+                import multiprocessing, concurrent.futures
+                context = multiprocessing.get_context( "spawn" )
+                with concurrent.futures.ProcessPoolExecutor( max_workers=len( builds ), \
+                                                             mp_context=context ) as pool:
+                    jobs = [ pool.submit( build__poleStep, side=build["side"], z1=z_pole, \
+                                          z2=z_root, radius=r_pole, stpFile=build["stpFile"], \
+                                          inpDir=inpDir ) for build in builds ]
+                    for job in jobs:
+                        job.result()
+            else:
+                for build in builds:
+                    gmsh.model.add( build["name"] )
+                    regions = gpl.generate__poleLayer( side=build["side"], z1=z_pole, z2=z_root, \
+                                                       radius=r_pole, inpDir=inpDir )
+                    gmsh.write( build["stpFile"] )
+                    apt.write__signatures( apt.sign__mapping( regions ), build["stpFile"] + ".parts" )
+                    gmsh.model.remove()
+            if ( const["geometry.pole_cache"] ):
+                for build in builds:
+                    mpc.store__poleCache( key=build["key"], stpFile=build["stpFile"], \
+                                          cacheDir=cacheDir, \
+                                          maxSize=const["geometry.pole_cache_size"] )
+            # -- load each model again ( regions from <stpFile>.parts ) -- #
             gmsh.model.setCurrent( "model" )
-            gmsh.model.occ.importShapes( "msh/pole_right.step" )
-            gmsh.model.occ.importShapes( "msh/pole_left.step" )
-            gmsh.model.occ.synchronize()
-            gmsh.model.occ.removeAllDuplicates()
+            for pside,stpFile in zip( ["+","-"], stpFiles ):
+                vols  = gmsh.model.occ.importShapes( stpFile )
+                vols  = [ tag for dim,tag in vols if ( dim == 3 ) ]
+                signs = apt.load__signatures( stpFile + ".parts" )
+                if ( signs is None ):
+                    apt.record__part( parts, "pole_{0}".format( names[pside] ), volumes=vols )
+                else:
+                    parts += list( apt.match__mapping( signs, tags=vols ).items() )
             gmsh.model.occ.synchronize()
+            if ( dedup ):
+                parts = list( apt.fragment__mapping( mapping=parts ).items() )
+    if ( side in ["+","-"] ):
+        apt.record__regions( parts, regions, suffix=names[side] )
             
         
     # ------------------------------------------------- #
@@ -97,11 +144,13 @@ def generate__magnetParts( side="+" ):
     z3 = h_iair1 + h_coil
     z4 = h_iair1 + h_coil + h_iair2
     if ( side in ["+","+-","-+"] ):
-        generate__coilslot( r1=r1, r2=r2, r3=r3, r4=r4, \
-                            z1=z1, z2=z2, z3=z3, z4=z4, side="+", hexahedral=hexahedral )
+        regions = generate__coilslot( r1=r1, r2=r2, r3=r3, r4=r4, \
+                                      z1=z1, z2=z2, z3=z3, z4=z4, side="+", hexahedral=hexahedral )
+        apt.record__regions( parts, regions, suffix="right" )
     if ( side in ["-","+-","-+"] ):
-        generate__coilslot( r1=r1, r2=r2, r3=r3, r4=r4, \
-                            z1=z1, z2=z2, z3=z3, z4=z4, side="-", hexahedral=hexahedral )
+        regions = generate__coilslot( r1=r1, r2=r2, r3=r3, r4=r4, \
+                                      z1=z1, z2=z2, z3=z3, z4=z4, side="-", hexahedral=hexahedral )
+        apt.record__regions( parts, regions, suffix="left" )
 
     # ------------------------------------------------- #
     # --- [3]  yoke making                          --- #
@@ -115,11 +164,13 @@ def generate__magnetParts( side="+" ):
     z3 = h_slot + h_yoke - h_cut
     z4 = h_slot + h_yoke
     if ( side in ["+","+-","-+"] ):
-        generate__yoke    ( r1=r1, r2=r2, r3=r3, r4=r4, \
-                            z1=z1, z2=z2, z3=z3, z4=z4, side="+", hexahedral=hexahedral )
+        regions = generate__yoke    ( r1=r1, r2=r2, r3=r3, r4=r4, \
+                                      z1=z1, z2=z2, z3=z3, z4=z4, side="+", hexahedral=hexahedral )
+        apt.record__regions( parts, regions, suffix="right" )
     if ( side in ["-","+-","-+"] ):
-        generate__yoke    ( r1=r1, r2=r2, r3=r3, r4=r4, \
-                            z1=z1, z2=z2, z3=z3, z4=z4, side="-", hexahedral=hexahedral )
+        regions = generate__yoke    ( r1=r1, r2=r2, r3=r3, r4=r4, \
+                                      z1=z1, z2=z2, z3=z3, z4=z4, side="-", hexahedral=hexahedral )
+        apt.record__regions( parts, regions, suffix="left" )
     
     # ------------------------------------------------- #
     # --- [4]  outside Air making                   --- #
@@ -133,14 +184,32 @@ def generate__magnetParts( side="+" ):
     z2 = h_slot + h_yoke - h_cut
     z4 = h_slot + h_yoke + h_oair
     if ( side in ["+","+-","-+"] ):
-        generate__outAir  ( r1=r1, r2=r2, r3=r3, r4=r4, \
-                            z1=z1, z2=z2, z3=z3, z4=z4, side="+", hexahedral=hexahedral )
+        regions = generate__outAir  ( r1=r1, r2=r2, r3=r3, r4=r4, \
+                                      z1=z1, z2=z2, z3=z3, z4=z4, side="+", hexahedral=hexahedral )
+        apt.record__regions( parts, regions, suffix="right" )
     if ( side in ["-","+-","-+"] ):
-        generate__outAir  ( r1=r1, r2=r2, r3=r3, r4=r4, \
-                            z1=z1, z2=z2, z3=z3, z4=z4, side="-", hexahedral=hexahedral )
-    
+        regions = generate__outAir  ( r1=r1, r2=r2, r3=r3, r4=r4, \
+                                      z1=z1, z2=z2, z3=z3, z4=z4, side="-", hexahedral=hexahedral )
+        apt.record__regions( parts, regions, suffix="left" )
+    return( parts )
 
     
+# ========================================================= #
+# ===  build a pole half in own gmsh session & save it  === #
+# ========================================================= #
+def build__poleStep( side="+", z1=0.7, z2=1.0, radius=1.0, stpFile=None, inpDir="dat" ):
+    import generate__poleLayer as gpl
+    gmsh.initialize()
+    gmsh.option.setNumber( "General.Terminal", 1 )
+    gmsh.option.setNumber( "Geometry.ToleranceBoolean", 1e-3 )
+    gmsh.model.add( "model" )
+    regions = gpl.generate__poleLayer( side=side, z1=z1, z2=z2, radius=radius, inpDir=inpDir )
+    gmsh.write( stpFile )
+    apt.write__signatures( apt.sign__mapping( regions ), stpFile + ".parts" )
+    gmsh.finalize()
+    return( stpFile )
+
+
 # ========================================================= #
 # ===  generate pole parts                              === #
 # ========================================================= #
@@ -150,16 +219,23 @@ def generate__pole( lc=0.0, r1=0.0, r2=0.7, \
     # --- [1] generate pole parts                   --- #
     # ------------------------------------------------- #
     origin  = [ 0.0, 0.0 ]
+    before  = apt.volumes__snapshot()
     gap     = sec.generate__sector180( lc=lc, r1=r1, r2=r2, hexahedral=hexahedral, tag=-1, \
                                        fuse=True, \
                                        zoffset=z1, height=z2-z1, defineVolu=True, side=side )
+    regions = { "gap":apt.volumes__since( before ) }
+    before  = apt.volumes__snapshot()
     pole    = sec.generate__sector180( lc=lc, r1=r1, r2=r2, hexahedral=hexahedral, tag=-1, \
                                        fuse=True, 
                                        zoffset=z2, height=z3-z2, defineVolu=True, side=side )
+    regions["poleTip"]  = apt.volumes__since( before )
+    before  = apt.volumes__snapshot()
     body    = sec.generate__sector180( lc=lc, r1=r1, r2=r2, hexahedral=hexahedral, tag=-1, \
                                        fuse=True, 
                                        zoffset=z3, height=z4-z3, defineVolu=True, side=side )
-    return()
+    regions["poleBody"] = apt.volumes__since( before )
+    #  -- regions :: { region name ( mesh.conf key ) : [ volume tags ] } --  #
+    return( regions )
 
 
 
@@ -172,17 +248,23 @@ def generate__coilslot( lc=0.0, r1=0.8, r2=0.9, r3=1.0, r4=1.1, \
     # --- [1] generate coil parts                   --- #
     # ------------------------------------------------- #
     origin  = [ 0.0, 0.0 ]
+    before  = apt.volumes__snapshot()
     air_inn = sec.generate__sector180( lc=lc, r1=r1, r2=r2, zoffset=z1, height=z4-z1, \
                                        defineVolu=True, side=side, hexahedral=hexahedral )
     air_bot = sec.generate__sector180( lc=lc, r1=r2, r2=r3, zoffset=z1, height=z2-z1, \
                                        defineVolu=True, side=side, hexahedral=hexahedral )
+    slot    = apt.volumes__since( before )
+    before  = apt.volumes__snapshot()
     coil    = sec.generate__sector180( lc=lc, r1=r2, r2=r3, zoffset=z2, height=z3-z2, \
                                        defineVolu=True, side=side, hexahedral=hexahedral )
+    coil    = apt.volumes__since( before )
+    before  = apt.volumes__snapshot()
     air_top = sec.generate__sector180( lc=lc, r1=r2, r2=r3, zoffset=z3, height=z4-z3, \
                                        defineVolu=True, side=side, hexahedral=hexahedral )
     air_out = sec.generate__sector180( lc=lc, r1=r3, r2=r4, zoffset=z1, height=z4-z1, \
                                        defineVolu=True, side=side, hexahedral=hexahedral )
-    return()
+    regions = { "slot":slot + apt.volumes__since( before ), "coil":coil }
+    return( regions )
 
 
 # ========================================================= #
@@ -196,13 +278,15 @@ def generate__yoke( lc=0.0, r1=0.0, r2=1.1, r3=1.4, r4=1.5, \
     origin      = [ 0.0, 0.0 ]
     origin_cone = [0.0,0.0,z3]
     th1,th2     = -90.0, 90.0
+    before      = apt.volumes__snapshot()
     yoke_h      = sec.generate__sector180( lc=lc, r1=r1, r2=r4, zoffset=z2, height=z3-z2, \
                                            defineVolu=True, side=side, hexahedral=hexahedral )
     yoke_v      = sec.generate__sector180( lc=lc, r1=r2, r2=r4, zoffset=z1, height=z2-z1, \
                                            defineVolu=True, side=side, hexahedral=hexahedral )
     york_c      = con.generate__coneShape( lc =lc , origin=origin_cone, r1=r4, r2=r3, \
                                            th1=th1, th2=th2, height=z4-z3, side=side )
-    return()
+    regions     = { "yoke":apt.volumes__since( before ) }
+    return( regions )
 
 
 # ========================================================= #
@@ -216,6 +300,7 @@ def generate__outAir( lc=0.0, r1=0.0, r2=1.1, r3=1.4, r4=1.5, \
     th1,th2     = -90.0, 90.0
     origin      = [ 0.0, 0.0 ]
     origin_cone = [0.0,0.0,z2]
+    before      = apt.volumes__snapshot()
     oAir_h      = sec.generate__sector180( lc=lc, r1=r1, r2=r4, zoffset=z2, height=z4-z2, \
                                            defineVolu=True, side=side, hexahedral=hexahedral )
     oAir_v      = sec.generate__sector180( lc=lc, r1=r3, r2=r4, zoffset=z1, height=z2-z1, \
@@ -228,4 +313,5 @@ def generate__outAir( lc=0.0, r1=0.0, r2=1.1, r3=1.4, r4=1.5, \
     target      = [ (3,( (oAir_h[0] )["volu"])["sector"]),(3,( (oAir_h[1] )["volu"])["sector"]) ]
     tool        = [(3,(oAir_c["volu"])["cone"])]
     ret         = gmsh.model.occ.cut( target, tool )
-    return()
+    regions     = { "outAir":apt.volumes__since( before ) }
+    return( regions )
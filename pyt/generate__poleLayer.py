@@ -1,13 +1,28 @@
 import numpy as np
 import os, sys
 import gmsh
+import profile__stages as prf
 
 
 # ========================================================= #
 # ===  generate pole parts of the magnet                === #
 # ========================================================= #
 
-def generate__poleLayer( lc=0.0, side="+", z1=0.0, z2=0.7, z3=1.0, radius=1.0 ):
+def generate__poleLayer( lc=0.0, side="+", z1=0.0, z2=0.7, z3=1.0, radius=1.0, mode="occ", \
+                         inpDir="dat", dedup=True ):
+
+    # ------------------------------------------------- #
+    # --- [0] discrete surface mode                 --- #
+    # ------------------------------------------------- #
+    #  -- discrete :: experiment only ( benchmark__poleMode ), pole-only model with --  #
+    #  --             its own walls & physical groups 301-303, not for make__magnet --  #
+    if   ( mode == "discrete" ):
+        import generate__discretePole as gdp
+        ret = gdp.generate__discretePole( side=side, z1=z1, z2=z2, radius=radius, inpDir=inpDir )
+        return( ret )
+    elif ( mode != "occ" ):
+        print( "[generate__poleLayer] mode == {0} ??? ERROR! ".format( mode ) )
+        sys.exit()
 
     # ------------------------------------------------- #
     # --- [1] preparation                           --- #
@@ -20,22 +35,21 @@ def generate__poleLayer( lc=0.0, side="+", z1=0.0, z2=0.7, z3=1.0, radius=1.0 ):
 
     #  -- [1-2] load point Data                     --  #
     if   ( side == "+" ):
-        nodFile = "dat/onmesh_right.dat"
-        mshFile = "dat/mesh_right.elements"
+        nodFile = os.path.join( inpDir, "onmesh_right.dat" )
+        mshFile = os.path.join( inpDir, "mesh_right.elements" )
     elif ( side == "-" ):
-        nodFile = "dat/onmesh_left.dat"
-        mshFile = "dat/mesh_left.elements"
+        nodFile = os.path.join( inpDir, "onmesh_left.dat"  )
+        mshFile = os.path.join( inpDir, "mesh_left.elements"  )
     else:
         print( "[generate__poleLayer] side == {0} ??? ERROR! ".format( side ) )
         sys.exit()
     
     #  -- [1-3] load point Data                     --  #
-    import nkUtilities.load__pointFile as lpf
-    pointData         = lpf.load__pointFile( inpFile=nodFile, returnType="point" )
+    import manage__pointData as mpd
+    pointData         = mpd.load__pointData( inpFile=nodFile, returnType="point" )
 
     #  -- [1-4] load connectivities                 --  #
-    with open( mshFile, "r" ) as f:
-        connectivities=np.loadtxt( f )
+    connectivities    = mpd.load__elementData( inpFile=mshFile )
     connectivities    = np.array( connectivities[:,3:], dtype=np.int64 )
     connectivities    = connectivities - 1
 
@@ -54,6 +68,7 @@ def generate__poleLayer( lc=0.0, side="+", z1=0.0, z2=0.7, z3=1.0, radius=1.0 ):
     generate__sideSurface( side=side, radius=radius, height=z1, \
                            pointData=pointData, connectivities=connectivities, \
                            onArc_check=onArc_check, onArc_index=onArc_index )
+    prf.record__stage( "  poleLayer[3] side surface", nested=True )
 
     # ------------------------------------------------- #
     # --- [4] define floor & ceiling sector         --- #
@@ -63,23 +78,34 @@ def generate__poleLayer( lc=0.0, side="+", z1=0.0, z2=0.7, z3=1.0, radius=1.0 ):
                                        side=side, defineSurf=True )
     ceiling = sec.generate__sector180( r1=0.0, r2=radius, zoffset=z1, \
                                        side=side, defineSurf=True )
+    prf.record__stage( "  poleLayer[4] floor & ceiling", nested=True )
 
     # ------------------------------------------------- #
     # --- [5] define diameter surface               --- #
     # ------------------------------------------------- #
     generate__diameterSurface( pointData=pointData, radius=radius, height=z1 )
+    #  -- one dedup :: merge coincident points / curves of [3]-[5] --  #
+    gmsh.model.occ.synchronize()
+    gmsh.model.occ.removeAllDuplicates()
+    gmsh.model.occ.synchronize()
+    prf.record__stage( "  poleLayer[5] diameter & dedup", nested=True )
 
     # ------------------------------------------------- #
     # --- [6] investigate entity numbers            --- #
     # ------------------------------------------------- #
-    entityNum  = investigate__entitiesNumber( height=z1 )
+    #  -- coordinate index of points & surfaces ( built once ) --  #
+    pointIndex = build__entityIndex( dim=0 )
+    surfIndex  = build__entityIndex( dim=2 )
+    entityNum  = investigate__entitiesNumber( height=z1, index=surfIndex )
 
     # ------------------------------------------------- #
     # --- [7] define pole surface                   --- #
     # ------------------------------------------------- #
     pole_surfs = generate__poleSurface( onArc_index=onArc_index, onArc_check=onArc_check, \
                                         other_index=other_index, connectivities=connectivities, \
-                                        pointData=pointData, entityNum=entityNum )
+                                        pointData=pointData, entityNum=entityNum, \
+                                        pointIndex=pointIndex )
+    prf.record__stage( "  poleLayer[7] pole surface", nested=True )
     
     # ------------------------------------------------- #
     # --- [8] volume difinition                     --- #
@@ -94,21 +120,28 @@ def generate__poleLayer( lc=0.0, side="+", z1=0.0, z2=0.7, z3=1.0, radius=1.0 ):
                    entityNum["ceiling1"], entityNum["ceiling2"] ] + pole_surfs
     s_group_up = gmsh.model.occ.addSurfaceLoop( upper_loop )
     upper_vol  = gmsh.model.occ.addVolume( [ s_group_up ] )
+    prf.record__stage( "  poleLayer[8] volume building", count=False, nested=True )
 
     # ------------------------------------------------- #
     # --- [9] pole Root section definition          --- #
     # ------------------------------------------------- #
+    import assemble__parts as apt
     height   = z2-z1
+    before   = apt.volumes__snapshot()
     root_vol = sec.generate__sector180( r1=0.0, r2=radius, zoffset=z1, height=height, \
                                         side=side, defineVolu=True, fuse=True )
+    regions  = { "gap":[ lower_vol ], "poleTip":[ upper_vol ], "poleBody":apt.volumes__since( before ) }
     
     # ------------------------------------------------- #
     # --- [10] post-process                         --- #
     # ------------------------------------------------- #
+    #  -- dedup=False :: left to the final fragment of the assembly --  #
+    #  -- ret :: { region name ( mesh.conf key ) : [ volume tags ] } --  #
     gmsh.model.occ.synchronize()
-    gmsh.model.occ.removeAllDuplicates()
-    gmsh.model.occ.synchronize()
-    ret = [ lower_vol, upper_vol, root_vol ]
+    if ( dedup ):
+        regions = apt.fragment__mapping( mapping=regions )
+    prf.record__stage( "  poleLayer[10] root & post-process", nested=True )
+    ret = regions
     return( ret )
     
 
@@ -121,22 +154,19 @@ def investigate__onArcElements( connectivities=None, pointData=None, radius=None
     x_, y_, z_       = 0, 1, 2
     
     # ------------------------------------------------- #
-    # --- [1] search onArc elements                 --- #
-    # ------------------------------------------------- #
-    onArc_check    = np.zeros( ( connectivities.shape[0], ), dtype=np.int64 )
-    for ik,cnc in enumerate(connectivities):
-        pt1 = pointData[ cnc[0], : ]
-        pt2 = pointData[ cnc[1], : ]
-        pt3 = pointData[ cnc[2], : ]
-        dr1 = np.sqrt( pt1[x_]**2 + pt1[y_]**2 ) - radius
-        dr2 = np.sqrt( pt2[x_]**2 + pt2[y_]**2 ) - radius
-        dr3 = np.sqrt( pt3[x_]**2 + pt3[y_]**2 ) - radius
-        if   ( ( dr2 > -eps ) and ( dr2 < +eps ) and ( dr3 > -eps ) and ( dr3 < +eps ) ):
-            onArc_check[ik] = 1
-        elif ( ( dr1 > -eps ) and ( dr1 < +eps ) and ( dr3 > -eps ) and ( dr3 < +eps ) ):
-            onArc_check[ik] = 2
-        elif ( ( dr1 > -eps ) and ( dr1 < +eps ) and ( dr2 > -eps ) and ( dr2 < +eps ) ):
-            onArc_check[ik] = 3
+    # --- [1] radial distance of each node          --- #
+    # ------------------------------------------------- #
+    dr             = np.sqrt( pointData[:,x_]**2 + pointData[:,y_]**2 ) - radius
+    onArc_node     = ( dr > -eps ) & ( dr < +eps )
+
+    # ------------------------------------------------- #
+    # --- [2] search onArc elements                 --- #
+    # ------------------------------------------------- #
+    #  -- onArc_check = index ( 1,2,3 ) of the inner node  --  #
+    onArc_elem     = onArc_node[ connectivities[:,0:3] ]
+    on1, on2, on3  = onArc_elem[:,0], onArc_elem[:,1], onArc_elem[:,2]
+    onArc_check    = np.select( [ on2 & on3, on1 & on3, on1 & on2 ], [ 1, 2, 3 ], default=0 )
+    onArc_check    = np.asarray( onArc_check, dtype=np.int64 )
     onArc_index    = ( np.where( onArc_check >  0 ) )[0]
     other_index    = ( np.where( onArc_check == 0 ) )[0]
 
@@ -155,71 +185,89 @@ def generate__sideSurface( pointData=None, connectivities=None, radius=None, hei
     lineDim, surfDim = 1, 2
 
     # ------------------------------------------------- #
-    # --- [1] surface for cut ( tool ) on Arc       --- #
-    # ------------------------------------------------- #
-    tools = []
-    for ie,idx in enumerate( onArc_index ):
-        #  - inner node - #
-        inn_id  = onArc_check[ idx ]-1
-        inn_nd  = connectivities[ idx, inn_id  ]
-        inn_pt  = pointData[ inn_nd, : ]
-        inn_md  = gmsh.model.occ.addPoint( inn_pt[x_], inn_pt[y_], inn_pt[z_] )
-        #  - onArc node - #
-        arc_ids = list( set( [0,1,2] ) - set( [inn_id] ) )
-        arc_nd1 = connectivities[ idx, arc_ids[0] ]
-        arc_nd2 = connectivities[ idx, arc_ids[1] ]
-        arc_pt1 = pointData[ arc_nd1, : ]
-        arc_pt2 = pointData[ arc_nd2, : ]
-        #  - sort ascending order   - #
-        if ( arc_pt1[y_] > arc_pt2[y_] ):
-            arc_pt1, arc_pt2 = arc_pt2, arc_pt1
-            arc_nd1, arc_nd2 = arc_nd2, arc_nd1
-        #  - define oversized area  - #
-        arc_ex1 = inn_pt + ( arc_pt1 - inn_pt ) * 1.3
-        arc_ex2 = inn_pt + ( arc_pt2 - inn_pt ) * 1.3
-        arc_md1 = gmsh.model.occ.addPoint( arc_ex1[x_], arc_ex1[y_], arc_ex1[z_] )
-        arc_md2 = gmsh.model.occ.addPoint( arc_ex2[x_], arc_ex2[y_], arc_ex2[z_] )
-        #  - line definition        - #
-        l1 = gmsh.model.occ.addLine( arc_md1, arc_md2 )
-        l2 = gmsh.model.occ.addLine( arc_md2, inn_md  )
-        l3 = gmsh.model.occ.addLine( inn_md , arc_md1 )
-        #  - surface definition     - #
-        cl = gmsh.model.occ.addCurveLoop( [l1,l2,l3]  )
-        sf = gmsh.model.occ.addPlaneSurface( [cl] )
-        tools.append( sf )
-
-    # ------------------------------------------------- #
-    # --- [2] define side surface to cut            --- #
-    # ------------------------------------------------- #
-    #  -- [2-1] side "+" case                       --  #
+    # --- [1] onArc nodes sorted by angle           --- #
+    # ------------------------------------------------- #
+    #  -- side "+" :: -90 -> +90 deg.,  side "-" :: +90 -> +270 deg. --  #
+    inn_id    = onArc_check[ onArc_index ] - 1
+    inn_nds   = connectivities[ onArc_index, inn_id ]
+    arc_nds   = np.stack( [ connectivities[ onArc_index, ( inn_id+1 ) % 3 ], \
+                            connectivities[ onArc_index, ( inn_id+2 ) % 3 ] ], axis=1 )
+    theta     = np.arctan2( pointData[:,y_], pointData[:,x_] )
+    if ( side == "-" ):
+        theta = np.mod( theta, 2.0*np.pi )
+    #  -- each segment from smaller to larger angle, segments in angle order --  #
+    swap      = theta[ arc_nds[:,0] ] > theta[ arc_nds[:,1] ]
+    arc_nds[swap] = arc_nds[swap][:,::-1]
+    order     = np.argsort( theta[ arc_nds[:,0] ] )
+    arc_nds, inn_nds = arc_nds[order], inn_nds[order]
+    nodes     = np.unique( arc_nds )
+    nodes     = nodes[ np.argsort( theta[nodes] ) ]
+
+    # ------------------------------------------------- #
+    # --- [2] dividing curve :: plane x cylinder    --- #
+    # ------------------------------------------------- #
+    #  -- element plane n.x = d on x^2+y^2=R^2 is an ellipse ::      --  #
+    #  --   c + a cos(t) + b sin(t),  c=(0,0,d/nz)                   --  #
+    #  --   a=(R,0,-R nx/nz), b=(0,R,-R ny/nz)                       --  #
+    #  -- principal axes from eigen vectors of gram matrix of (a,b)  --  #
+    #  -- coincident end points are merged by the following dedup    --  #
+    pieces    = []
+    for (nd1,nd2),inn in zip( arc_nds, inn_nds ):
+        pA, pB, pI = pointData[nd1,0:3], pointData[nd2,0:3], pointData[inn,0:3]
+        nv         = np.cross( pA-pI, pB-pI )
+        center     = np.array( [ 0.0, 0.0, np.dot( nv, pI ) / nv[z_] ] )
+        av         = np.array( [ radius, 0.0, - radius*nv[x_]/nv[z_] ] )
+        bv         = np.array( [ 0.0, radius, - radius*nv[y_]/nv[z_] ] )
+        gram       = np.array( [ [ np.dot( av,av ), np.dot( av,bv ) ], \
+                                 [ np.dot( av,bv ), np.dot( bv,bv ) ] ] )
+        lam, vec   = np.linalg.eigh( gram )
+        r1, r2     = np.sqrt( lam[1] ), np.sqrt( lam[0] )
+        e1         = ( vec[0,1]*av + vec[1,1]*bv ) / r1
+        e2         = ( vec[0,0]*av + vec[1,0]*bv ) / r2
+        angle      = lambda pt: np.arctan2( np.dot( pt-center, e2 )/r2, np.dot( pt-center, e1 )/r1 )
+        ang1       = angle( pA )
+        dang       = np.mod( angle( pB ) - ang1 + np.pi, 2.0*np.pi ) - np.pi
+        if ( dang < 0.0 ):
+            #  -- flip minor axis :: short arc runs counter-clockwise --  #
+            e2, ang1, dang = -e2, -ang1, -dang
+        zAxis      = list( np.cross( e1, e2 ) )
+        if ( ( r1 - r2 ) < 1.e-12 * r1 ):
+            pieces.append( gmsh.model.occ.addCircle ( *center, r1,     angle1=ang1, angle2=ang1+dang, \
+                                                      zAxis=zAxis, xAxis=list( e1 ) ) )
+        else:
+            pieces.append( gmsh.model.occ.addEllipse( *center, r1, r2, angle1=ang1, angle2=ang1+dang, \
+                                                      zAxis=zAxis, xAxis=list( e1 ) ) )
+
+    # ------------------------------------------------- #
+    # --- [3] bottom / top arcs & vertical lines    --- #
+    # ------------------------------------------------- #
+    th1, th2  = theta[ nodes[0] ], theta[ nodes[-1] ]
+    bot_arc   = gmsh.model.occ.addCircle( origin[x_], origin[y_], 0.0   , radius, angle1=th1, angle2=th2 )
+    top_arc   = gmsh.model.occ.addCircle( origin[x_], origin[y_], height, radius, angle1=th1, angle2=th2 )
+    def vertical( nd, z1, z2 ):
+        pt1   = gmsh.model.occ.addPoint( pointData[nd,x_], pointData[nd,y_], z1 )
+        pt2   = gmsh.model.occ.addPoint( pointData[nd,x_], pointData[nd,y_], z2 )
+        return( gmsh.model.occ.addLine( pt1, pt2 ) )
+    v_lower   = [ vertical( nd, 0.0, pointData[nd,z_] ) for nd in [ nodes[0], nodes[-1] ] ]
+    v_upper   = [ vertical( nd, pointData[nd,z_], height ) for nd in [ nodes[0], nodes[-1] ] ]
+
+    # ------------------------------------------------- #
+    # --- [4] trim the half-cylinder by two wires   --- #
+    # ------------------------------------------------- #
+    #  -- no boolean :: lower & upper walls share the dividing pieces --  #
     if ( side == "+" ):
-        pth1         = -90.0 / 180.0 * np.pi
-        pth2         = +90.0 / 180.0 * np.pi
-        arc1         = gmsh.model.occ.addCircle( origin[x_], origin[y_], origin[z_], \
-                                                 radius, angle1=pth1, angle2=pth2 )
-        dx,dy,dz     = 0.0, 0.0, height
-        ret          = gmsh.model.occ.extrude( [(lineDim,arc1)], dx,dy,dz )
-        circumf_surf = ret[1][1]
+        pth1, pth2   = -90.0 / 180.0 * np.pi, +90.0 / 180.0 * np.pi
     if ( side == "-" ):
-        pth1         =  90.0 / 180.0 * np.pi
-        pth2         = 270.0 / 180.0 * np.pi
-        arc1         = gmsh.model.occ.addCircle( origin[x_], origin[y_], origin[z_], \
-                                                 radius, angle1=pth1, angle2=pth2 )
-        dx,dy,dz     = 0.0, 0.0, height
-        ret          = gmsh.model.occ.extrude( [(lineDim,arc1)], dx,dy,dz )
-        circumf_surf = ret[1][1]
-
-    # ------------------------------------------------- #
-    # --- [3] boolean cut of the surfaces           --- #
-    # ------------------------------------------------- #
-    gmsh.model.occ.synchronize()
-    target = [(surfDim,circumf_surf)]
-    tools  = [(surfDim,int( tool ) ) for tool in tools ]
-    ret    = gmsh.model.occ.cut( target, tools, removeObject=False, removeTool=False )
-    gmsh.model.occ.remove( tools, recursive=True )
-    gmsh.model.occ.synchronize()
-    gmsh.model.occ.removeAllDuplicates()
-    gmsh.model.occ.synchronize()
+        pth1, pth2   =  90.0 / 180.0 * np.pi, 270.0 / 180.0 * np.pi
+    arc1         = gmsh.model.occ.addCircle( origin[x_], origin[y_], origin[z_], \
+                                             radius, angle1=pth1, angle2=pth2 )
+    ret          = gmsh.model.occ.extrude( [(lineDim,arc1)], 0.0, 0.0, height )
+    circumf_surf = ret[1][1]
+    w_lower      = gmsh.model.occ.addWire( [ bot_arc, v_lower[1] ] + pieces[::-1] + [ v_lower[0] ] )
+    w_upper      = gmsh.model.occ.addWire( pieces + [ v_upper[1], top_arc, v_upper[0] ] )
+    gmsh.model.occ.addTrimmedSurface( circumf_surf, [ w_lower ], wire3D=True )
+    gmsh.model.occ.addTrimmedSurface( circumf_surf, [ w_upper ], wire3D=True )
+    gmsh.model.occ.remove( [(surfDim,circumf_surf)], recursive=True )
     return()
 
 
@@ -245,69 +293,47 @@ def generate__diameterSurface( pointData=None, radius=None, height=None ):
     onDia_points     = onDia_points[index][:]
 
     # ------------------------------------------------- #
-    # --- [2] points to be plot ( Quad )            --- #
+    # --- [2] polyline of the pole profile ( x=0 )  --- #
     # ------------------------------------------------- #
-    square_width     = 0.1 * radius
-    onDia_ext1       = np.copy( onDia_points )
-    onDia_ext2       = np.copy( onDia_points )
-    onDia_ext1[:,x_] = - square_width
-    onDia_ext2[:,x_] = + square_width
+    #  -- from y=-R to y=+R, shared by lower & upper surfaces --  #
     nDiameter        = onDia_points.shape[0]
+    pnums            = [ gmsh.model.occ.addPoint( 0.0, pt[y_], pt[z_] ) for pt in onDia_points ]
+    profile          = [ gmsh.model.occ.addLine( pnums[ik], pnums[ik+1] ) \
+                         for ik in range( nDiameter-1 ) ]
 
     # ------------------------------------------------- #
-    # --- [3]  add points to the model              --- #
+    # --- [3] corners & outer lines of the plane    --- #
     # ------------------------------------------------- #
-    pnums1, pnums2 = [], []
-    for ik in range( nDiameter ):
-        pt1   = onDia_ext1[ik]
-        pt2   = onDia_ext2[ik]
-        pnum1 = gmsh.model.occ.addPoint( pt1[x_], pt1[y_], pt1[z_] )
-        pnum2 = gmsh.model.occ.addPoint( pt2[x_], pt2[y_], pt2[z_] )
-        pnums1.append( pnum1 )
-        pnums2.append( pnum2 )
+    y1, y2           = onDia_points[0,y_], onDia_points[-1,y_]
+    c_bot1           = gmsh.model.occ.addPoint( 0.0, y1, 0.0    )
+    c_bot2           = gmsh.model.occ.addPoint( 0.0, y2, 0.0    )
+    c_top1           = gmsh.model.occ.addPoint( 0.0, y1, height )
+    c_top2           = gmsh.model.occ.addPoint( 0.0, y2, height )
+    l_bot            = gmsh.model.occ.addLine( c_bot1  , c_bot2    )
+    l_top            = gmsh.model.occ.addLine( c_top2  , c_top1    )
+    v_lw1            = gmsh.model.occ.addLine( pnums[0], c_bot1    )
+    v_lw2            = gmsh.model.occ.addLine( c_bot2  , pnums[-1] )
+    v_up1            = gmsh.model.occ.addLine( c_top1  , pnums[0]  )
+    v_up2            = gmsh.model.occ.addLine( pnums[-1], c_top2   )
 
     # ------------------------------------------------- #
-    # --- [4] define quad to cut                    --- #
-    # ------------------------------------------------- #
-    tools = []
-    for ik in range( nDiameter-1 ):
-        l1 = gmsh.model.occ.addLine( pnums1[ik  ], pnums1[ik+1] )
-        l2 = gmsh.model.occ.addLine( pnums1[ik+1], pnums2[ik+1] )
-        l3 = gmsh.model.occ.addLine( pnums2[ik+1], pnums2[ik  ] )
-        l4 = gmsh.model.occ.addLine( pnums2[ik  ], pnums1[ik  ] )
-        cl = gmsh.model.occ.addCurveLoop( [l1,l2,l3,l4] )
-        sf = gmsh.model.occ.addPlaneSurface( [cl] )
-        tools.append( sf )
-        
-    # ------------------------------------------------- #
-    # --- [5] define diameter surface to be cut     --- #
-    # ------------------------------------------------- #
-    import nkGmshRoutines.generate__quadShape as gqs
-    x1,x2,x3,x4  = [ [ 0.0, - radius,    0.0 ],
-                     [ 0.0, + radius,    0.0 ],
-                     [ 0.0, + radius, height ],
-                     [ 0.0, - radius, height ] ]
-    ret          = gqs.generate__quadShape( x1=x1, x2=x2, x3=x3, x4=x4 )
-    onDia_surf   = ret["surf"]["quad"]
-    
+    # --- [4] lower & upper diameter surfaces       --- #
     # ------------------------------------------------- #
-    # --- [6] boolean cut of the surface            --- #
-    # ------------------------------------------------- #
-    target = [(surfDim,onDia_surf)]
-    tools  = [(surfDim,int( tool ) ) for tool in tools ]
-    gmsh.model.occ.synchronize()
-    ret    = gmsh.model.occ.cut( target, tools, removeObject=False, removeTool=False )
-    gmsh.model.occ.remove( tools, recursive=True )
-    gmsh.model.occ.synchronize()
-    gmsh.model.occ.removeAllDuplicates()
-    gmsh.model.occ.synchronize()
+    #  -- direct split at the on-diameter nodes ( no tool, no boolean ) --  #
+    lower            = [ l_bot, v_lw2 ] + profile[::-1] + [ v_lw1 ]
+    upper            = profile + [ v_up2, l_top, v_up1 ]
+    cl_lower         = gmsh.model.occ.addCurveLoop( lower )
+    cl_upper         = gmsh.model.occ.addCurveLoop( upper )
+    onDia_lower      = gmsh.model.occ.addPlaneSurface( [ cl_lower ] )
+    onDia_upper      = gmsh.model.occ.addPlaneSurface( [ cl_upper ] )
+    return( [ onDia_lower, onDia_upper ] )
 
 
 # ========================================================= #
 # ===  obtain elemental entity number                   === #
 # ========================================================= #
 
-def investigate__entitiesNumber( height=None, debug=False ):
+def investigate__entitiesNumber( height=None, debug=False, index=None ):
 
     eps              = 1.e-8
     x_, y_, z_       = 0, 1, 2
@@ -317,28 +343,22 @@ def investigate__entitiesNumber( height=None, debug=False ):
     # --- [1] obtain elemental entity number        --- #
     # ------------------------------------------------- #
     #  -- [1-1] grouping                            --  #
-    s_dimtag                 = gmsh.model.getEntities(2)
-    surfs                    = [ int( dimtag[1] ) for dimtag in s_dimtag ]
-    ceilings, floors, onDia = [], [], []
-    for iS,surfnum in enumerate(surfs):
-        CoM = gmsh.model.occ.getCenterOfMass( surfDim, surfnum )
-        if   ( ( CoM[x_]          > -eps ) and ( CoM[x_]          < +eps ) ):
-            onDia   .append( surfnum )
-        elif ( ( CoM[z_]          > -eps ) and ( CoM[z_]          < +eps ) ):
-            floors  .append( surfnum )
-        elif ( ( CoM[z_] - height > -eps ) and ( CoM[z_] - height < +eps ) ):
-            ceilings.append( surfnum )
-    side_surfs = list( set( surfs ) - set( ceilings ) - set( floors ) - set( onDia ) )
+    if ( index is None ):
+        index                = build__entityIndex( dim=surfDim, eps=eps )
+    surfs, CoM               = index["tags"], index["coords"]
+    is_onDia                 = ( np.abs( CoM[:,x_]          ) < eps )
+    is_floor                 = ( np.abs( CoM[:,z_]          ) < eps ) & ( ~is_onDia )
+    is_ceiling               = ( np.abs( CoM[:,z_] - height ) < eps ) & ( ~is_onDia ) & ( ~is_floor )
+    is_side                  = ~( is_onDia | is_floor | is_ceiling )
+    onDia, floors, ceilings  = surfs[is_onDia], surfs[is_floor], surfs[is_ceiling]
+    side_surfs, z_side       = surfs[is_side ], CoM[is_side ,z_]
+    z_onDia                  = CoM[is_onDia,z_]
     #  -- [1-2] labeling                             -- #
-    z1 = ( gmsh.model.occ.getCenterOfMass( surfDim, side_surfs[0] ) )[z_]
-    z2 = ( gmsh.model.occ.getCenterOfMass( surfDim, side_surfs[1] ) )[z_]
-    z3 = ( gmsh.model.occ.getCenterOfMass( surfDim, onDia[0] )     )[z_]
-    z4 = ( gmsh.model.occ.getCenterOfMass( surfDim, onDia[1] )     )[z_]
-    if ( z1 > z2 ):
+    if ( z_side[0] > z_side[1] ):
         side_upper, side_lower = side_surfs[0], side_surfs[1]
     else:
         side_upper, side_lower = side_surfs[1], side_surfs[0]
-    if ( z3 > z4 ):
+    if ( z_onDia[0] > z_onDia[1] ):
         onDia_upper, onDia_lower = onDia[0], onDia[1]
     else:
         onDia_upper, onDia_lower = onDia[1], onDia[0]
@@ -355,7 +375,57 @@ def investigate__entitiesNumber( height=None, debug=False ):
     ret["ceiling1"]   , ret["ceiling2"]    = ceilings[0], ceilings[1]
     ret["side_upper"] , ret["side_lower"]  =  side_upper,  side_lower
     ret["onDia_upper"], ret["onDia_lower"] = onDia_upper, onDia_lower
+    ret = { key:int( val ) for key,val in ret.items() }
+    return( ret )
+
+
+# ========================================================= #
+# ===  coordinate hash index of model entities          === #
+# ========================================================= #
+
+def build__entityIndex( dim=0, eps=1.e-8 ):
+
+    # ------------------------------------------------- #
+    # --- [1] coordinates of every entity           --- #
+    # ------------------------------------------------- #
+    #  -- point :: its position, others :: center of mass  --  #
+    dimtags   = gmsh.model.getEntities( dim )
+    tags      = np.array( [ int( dimtag[1] ) for dimtag in dimtags ], dtype=np.int64 )
+    if ( dim == 0 ):
+        coords = [ gmsh.model.getValue( dim, tag, [] )        for tag in tags ]
+    else:
+        coords = [ gmsh.model.occ.getCenterOfMass( dim, tag ) for tag in tags ]
+    coords    = np.reshape( np.array( coords, dtype=np.float64 ), (-1,3) )
+
+    # ------------------------------------------------- #
+    # --- [2] quantized coordinate -> tag table     --- #
+    # ------------------------------------------------- #
+    keys      = np.floor( coords / eps ).astype( np.int64 )
+    table     = {}
+    for ik,key in enumerate( keys.tolist() ):
+        table.setdefault( tuple( key ), [] ).append( ik )
+    ret       = { "dim":dim, "eps":eps, "tags":tags, "coords":coords, "table":table }
     return( ret )
+
+
+# ========================================================= #
+# ===  look up entity tag at given coordinate           === #
+# ========================================================= #
+
+def lookup__entityIndex( index=None, point=None ):
+
+    # ------------------------------------------------- #
+    # --- [1] search own & neighboring cells        --- #
+    # ------------------------------------------------- #
+    eps       = index["eps"]
+    point     = np.asarray( point[0:3], dtype=np.float64 )
+    key       = np.floor( point / eps ).astype( np.int64 )
+    for offset in np.ndindex( 3, 3, 3 ):
+        cell  = tuple( ( key + np.array( offset ) - 1 ).tolist() )
+        for ik in index["table"].get( cell, [] ):
+            if ( np.all( np.abs( index["coords"][ik] - point ) <= eps ) ):
+                return( int( index["tags"][ik] ) )
+    return( None )
     
 
 # ========================================================= #
@@ -363,7 +433,8 @@ def investigate__entitiesNumber( height=None, debug=False ):
 # ========================================================= #
 
 def generate__poleSurface( onArc_index=None, onArc_check=None, other_index=None, \
-                           connectivities=None, pointData=None, entityNum=None ):
+                           connectivities=None, pointData=None, entityNum=None, \
+                           pointIndex=None ):
 
     eps              = 1.e-8
     x_, y_, z_       = 0, 1, 2
@@ -402,65 +473,91 @@ def generate__poleSurface( onArc_index=None, onArc_check=None, other_index=None,
 
     
     # ------------------------------------------------- #
-    # --- [3] define onArc surfaces                 --- #
-    # ------------------------------------------------- #
-    arc_surfs   = []
-    for ie,idx in enumerate( onArc_index ):
-        #  - inner node - #
-        inn_id  = onArc_check[ idx ]-1
-        inn_nd  = connectivities[ idx, inn_id  ]
-        inn_pt  = pointData[ inn_nd, : ]
-        inn_md  = gmsh.model.occ.addPoint( inn_pt[x_], inn_pt[y_], inn_pt[z_] )
-        #  - onArc node - #
-        ids = list( set( [0,1,2] ) - set( [inn_id] ) )
-        nd1 = connectivities[ idx, ids[0] ]
-        nd2 = connectivities[ idx, ids[1] ]
-        pt1 = pointData[ nd1, : ]
-        pt2 = pointData[ nd2, : ]
-        md1 = gmsh.model.getEntitiesInBoundingBox( pt1[x_]-eps, pt1[y_]-eps, pt1[z_]-eps, \
-                                                   pt1[x_]+eps, pt1[y_]+eps, pt1[z_]+eps, dim=0 )
-        md2 = gmsh.model.getEntitiesInBoundingBox( pt2[x_]-eps, pt2[y_]-eps, pt2[z_]-eps, \
-                                                   pt2[x_]+eps, pt2[y_]+eps, pt2[z_]+eps, dim=0 )
-        md1,md2    = md1[0][1], md2[0][1]
-        key        = "{0}_{1}".format( min( md1, md2 ), max( md1, md2 ) )
-        line12     = gmsh.model.occ.addLine( inn_md,    md1 )
-        line31     = gmsh.model.occ.addLine(    md2, inn_md )
-        arc23      = arc_lines[key]
-        
-        l_group    = gmsh.model.occ.addCurveLoop( [ line12, arc23, line31 ] )
-        s_num      = gmsh.model.occ.addPlaneSurface( [ l_group ] )
-        arc_surfs.append( s_num )
-
+    # --- [3] unique edges of the pole mesh         --- #
+    # ------------------------------------------------- #
+    edges       = build__edgeIndex( connectivities=connectivities )
+    elem_edges  = edges["elem_edges"]
+    edge_nodes  = edges["edge_nodes"]
+    #  -- edge opposite to the inner node is on Arc --  #
+    inn_id      = onArc_check[ onArc_index ] - 1
+    arc_edges   = elem_edges[ onArc_index, ( inn_id+1 ) % 3 ]
+
+    # ------------------------------------------------- #
+    # --- [4] define each mesh node only once       --- #
+    # ------------------------------------------------- #
+    nodeTags    = np.full( ( pointData.shape[0], ), -1, dtype=np.int64 )
+    #  -- [4-1] onArc nodes :: already in the model --  #
+    if ( pointIndex is None ):
+        pointIndex = build__entityIndex( dim=0, eps=eps )
+    arc_nodes   = np.unique( edge_nodes[ arc_edges ] )
+    for nd in arc_nodes:
+        tag = lookup__entityIndex( index=pointIndex, point=pointData[nd,:] )
+        if ( tag is None ):
+            sys.exit( "[generate__poleSurface] no model point at onArc node {0} :: {1} ??? "\
+                      .format( nd, pointData[nd,0:3] ) )
+        nodeTags[nd] = tag
+    #  -- [4-2] other nodes :: new points           --  #
+    used_nodes  = np.unique( connectivities[:,0:3] )
+    for nd in used_nodes[ nodeTags[ used_nodes ] < 0 ]:
+        pt  = pointData[ nd, : ]
+        nodeTags[nd] = gmsh.model.occ.addPoint( pt[x_], pt[y_], pt[z_] )
+
+    # ------------------------------------------------- #
+    # --- [5] define each mesh edge only once       --- #
+    # ------------------------------------------------- #
+    lineTags    = np.zeros( ( edge_nodes.shape[0], ), dtype=np.int64 )
+    #  -- [5-1] onArc edges :: divided arc pieces   --  #
+    for ie in arc_edges:
+        md1, md2     = nodeTags[ edge_nodes[ie,0] ], nodeTags[ edge_nodes[ie,1] ]
+        key          = "{0}_{1}".format( min( md1, md2 ), max( md1, md2 ) )
+        lineTags[ie] = arc_lines[key]
+    #  -- [5-2] other edges :: straight lines       --  #
+    for ie in np.where( lineTags == 0 )[0]:
+        md1, md2     = nodeTags[ edge_nodes[ie,0] ], nodeTags[ edge_nodes[ie,1] ]
+        lineTags[ie] = gmsh.model.occ.addLine( int( md1 ), int( md2 ) )
+
+    # ------------------------------------------------- #
+    # --- [6] define triangles from shared edges    --- #
+    # ------------------------------------------------- #
+    def define__triangles( index ):
+        surfs = []
+        for idx in index:
+            lns     = [ int( lineTags[ie] ) for ie in elem_edges[idx] ]
+            l_Group = gmsh.model.occ.addCurveLoop( lns )
+            surfs.append( gmsh.model.occ.addPlaneSurface( [l_Group] ) )
+        return( surfs )
+    tris        = define__triangles( other_index )
+    arc_surfs   = define__triangles( onArc_index )
+
+    # ------------------------------------------------- #
+    # --- [7] post-process                          --- #
+    # ------------------------------------------------- #
     gmsh.model.occ.synchronize()
     gmsh.model.occ.removeAllDuplicates()
     gmsh.model.occ.synchronize()
-        
+    ret = tris + arc_surfs
+    return( ret )
+
+
+# ========================================================= #
+# ===  unique undirected edges of triangle mesh         === #
+# ========================================================= #
+
+def build__edgeIndex( connectivities=None ):
+
     # ------------------------------------------------- #
-    # --- [4] define normal triangles               --- #
+    # --- [1] edges of each triangle ( 01,12,20 )   --- #
     # ------------------------------------------------- #
-    tris = []
-    for ie,idx in enumerate( other_index ):
-        mds, lns = [], []
-        for iv in [0,1,2]:
-            nd = connectivities[idx,iv]
-            pt = pointData[ nd, : ]
-            md = gmsh.model.occ.addPoint( pt[x_], pt[y_], pt[z_] )
-            mds.append( md )
-        for iv in [ [0,1], [1,2], [2,0] ]:
-            ln = gmsh.model.occ.addLine( mds[ iv[0] ], mds[ iv[1] ] )
-            lns.append( ln )
-        l_Group = gmsh.model.occ.addCurveLoop( [ lns[0], lns[1], lns[2] ] )
-        tri     = gmsh.model.occ.addPlaneSurface( [l_Group] )
-        tris.append( tri )
+    nElem       = connectivities.shape[0]
+    edges       = connectivities[ :, [ [0,1], [1,2], [2,0] ] ]
+    edges       = np.sort( np.reshape( edges, (-1,2) ), axis=1 )
 
     # ------------------------------------------------- #
-    # --- [5] post-process                          --- #
+    # --- [2] unique edges & element -> edge table  --- #
     # ------------------------------------------------- #
-    
-    gmsh.model.occ.synchronize()
-    gmsh.model.occ.removeAllDuplicates()
-    gmsh.model.occ.synchronize()
-    ret = tris + arc_surfs
+    edge_nodes, inverse = np.unique( edges, axis=0, return_inverse=True )
+    elem_edges  = np.reshape( inverse, (nElem,3) )
+    ret         = { "edge_nodes":edge_nodes, "elem_edges":elem_edges }
     return( ret )
         
 
@@ -481,7 +578,11 @@ if ( __name__=="__main__" ):
     # ------------------------------------------------- #
     # --- [2] define model                          --- #
     # ------------------------------------------------- #
-    generate__poleLayer()
+    cnsFile = "dat/parameter.conf"
+    import nkUtilities.load__constants as lcn
+    const   = lcn.load__constants( inpFile=cnsFile )
+    generate__poleLayer( side=const["geometry.side"], z1=const["geometry.z_pole"], \
+                         z2=const["geometry.z_root"], radius=const["geometry.r_pole"] )
     
     # ------------------------------------------------- #
     # --- [3] post process                          --- #
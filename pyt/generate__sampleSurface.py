@@ -1,52 +1,107 @@
 import numpy as np
+import os, sys
 
 # ========================================================= #
 # ===  generatesampleSurface                            === #
 # ========================================================= #
 
-def generate__sampleSurface():
+def generate__sampleSurface( dataFormat="text", LI=31, LJ=31, bbox=[-1.0,+1.0,-1.0,+1.0], \
+                             surface="parabolic", params=None, outFile="dat/mshape_svd.dat", \
+                             chunk=2**20 ):
 
-    x_,y_,z_     = 0, 1, 2
-    xMin,xMax,LI = -1.0, +1.0, +31
-    yMin,yMax,LJ = -1.0, +1.0, +31
-    
     # ------------------------------------------------- #
     # --- [1] coordinate                            --- #
     # ------------------------------------------------- #
-    import nkUtilities.equiSpaceGrid as esg
-    x1MinMaxNum = [ xMin, xMax, LI ]
-    x2MinMaxNum = [ yMin, yMax, LJ ]
-    x3MinMaxNum = [  0.0,  0.0,  1 ]
-    grid        = esg.equiSpaceGrid( x1MinMaxNum=x1MinMaxNum, x2MinMaxNum=x2MinMaxNum, \
-                                     x3MinMaxNum=x3MinMaxNum, returnType = "structured" )
+    #  -- bbox :: [ xMin, xMax, yMin, yMax ], x along LI, y along LJ --  #
+    #  -- surface :: name in surface__functions, or f( xpos, ypos, **params ) --  #
+    xMin,xMax,yMin,yMax = bbox
+    xAxis       = np.linspace( xMin, xMax, LI )
+    yAxis       = np.linspace( yMin, yMax, LJ )
+    if ( params is None ):
+        params  = {}
+    if ( isinstance( surface, str ) ):
+        if ( not( surface in surface__functions ) ):
+            sys.exit( "[generate__sampleSurface] surface == {0} ??? {1}".format( surface, list( surface__functions ) ) )
+        surf_func = surface__functions[surface]
+    else:
+        surf_func = surface
 
     # ------------------------------------------------- #
-    # --- [2] function                              --- #
+    # --- [2] output ( 1,LJ,LI,6 ) grid             --- #
     # ------------------------------------------------- #
-    def surf_func( xpos, ypos, radius=1.0 ):
-        radii_h = ( xpos**2 + ypos**2 ) / radius
-        phi     = np.arctan2( ypos, xpos )
-        zpos    = 0.1 * ( 1.0 - radii_h ) + 0.3
-        return( zpos )
+    #  -- npy  :: memmap, rows written in place      --  #
+    #  -- text :: nkUtilities point-file format, rows appended --  #
+    if   ( dataFormat == "npy"  ):
+        import manage__pointData as mpd
+        mshape  = np.lib.format.open_memmap( mpd.binaryFile( outFile ), mode="w+", \
+                                             dtype=np.float64, shape=(1,LJ,LI,6) )
+    elif ( dataFormat == "text" ):
+        f       = open( outFile, "w" )
+        f.write( "# x1 x2 x3 x4 x5 x6\n# {0} 6\n# 1 {1} {2} 6\n".format( LI*LJ, LJ, LI ) )
+    else:
+        sys.exit( "[generate__sampleSurface] format == {0} ??? ( text, npy ) ".format( dataFormat ) )
 
     # ------------------------------------------------- #
-    # --- [3] save sample surface                   --- #
+    # --- [3] evaluate in chunks of rows            --- #
     # ------------------------------------------------- #
-    grid[:,:,:,z_]  = surf_func( grid[:,:,:,x_], grid[:,:,:,y_] )
-    grid            = np.reshape( grid, (1,LJ,LI,3) )
-    mshape          = np.zeros( (1,LJ,LI,6) )
-    mshape[...,0:3] = grid
-    mshape[...,  3] = grid[...,2]
-    mshape[...,  4] = 0
-    mshape[...,  5] = 1.0
-    outFile         = "dat/mshape_svd.dat"
-    import nkUtilities.save__pointFile as spf
-    spf.save__pointFile( outFile=outFile, Data=mshape )
+    #  -- memory :: ~ chunk points, independent of LI x LJ --  #
+    nRow        = max( 1, chunk // LI )
+    for j1 in range( 0, LJ, nRow ):
+        j2            = min( j1+nRow, LJ )
+        xpos, ypos    = np.meshgrid( xAxis, yAxis[j1:j2] )
+        block         = np.zeros( (j2-j1,LI,6) )
+        block[...,0]  = xpos
+        block[...,1]  = ypos
+        block[...,2]  = surf_func( xpos, ypos, **params )
+        block[...,3]  = block[...,2]
+        block[...,4]  = 0.0
+        block[...,5]  = 1.0
+        if ( dataFormat == "npy" ):
+            mshape[0,j1:j2] = block
+        else:
+            np.savetxt( f, np.reshape( block, (-1,6) ), fmt="%15.8e" )
+    if ( dataFormat == "npy" ):
+        mshape.flush()
+        del( mshape )
+    else:
+        f.close()
+    print( "[generate__sampleSurface] ( {0} x {1} ) outFile :: {2}".format( LJ, LI, outFile ) )
+    return( outFile )
 
 
+# ========================================================= #
+# ===  surface functions ( vectorized )                 === #
+# ========================================================= #
+
+def surf__parabolic( xpos, ypos, radius=1.0, z0=0.3, height=0.1 ):
+    radii_h = ( xpos**2 + ypos**2 ) / radius
+    zpos    = height * ( 1.0 - radii_h ) + z0
+    return( zpos )
+
+def surf__rogowski( xpos, ypos, z0=0.4, r_flat=0.7, width=0.1, depth=0.3 ):
+    #  -- flat face, rounded off beyond r_flat ( softplus, slope -> depth ) --  #
+    radii   = np.sqrt( xpos**2 + ypos**2 )
+    zpos    = z0 - depth * width * np.logaddexp( 0.0, ( radii - r_flat ) / width )
+    return( zpos )
+
+def surf__shimmed( xpos, ypos, radius=1.0, z0=0.3, height=0.1, \
+                   shims=[ [ 0.8, 0.05, 0.01 ] ] ):
+    #  -- shims :: [ [ r_shim, width, amplitude ], ... ] gaussian rings on parabolic --  #
+    radii   = np.sqrt( xpos**2 + ypos**2 )
+    zpos    = surf__parabolic( xpos, ypos, radius=radius, z0=z0, height=height )
+    for r_shim,width,amplitude in shims:
+        zpos = zpos + amplitude * np.exp( - ( ( radii - r_shim ) / width )**2 )
+    return( zpos )
+
+surface__functions = { "parabolic":surf__parabolic, "rogowski":surf__rogowski, \
+                       "shimmed"  :surf__shimmed }
+
 
 # ========================================================= #
 # ===   実行部                                          === #
 # ========================================================= #
 if ( __name__=="__main__" ):
-    generate__sampleSurface()
+    cnsFile = "dat/parameter.conf"
+    import nkUtilities.load__constants as lcn
+    const   = lcn.load__constants( inpFile=cnsFile )
+    generate__sampleSurface( dataFormat=const["data.format"] )
@@ -0,0 +1,135 @@
+import numpy as np
+import os, sys
+
+
+# ========================================================= #
+# ===  build interpolator on equi-spaced grid ( once )   === #
+# ========================================================= #
+
+def build__gridInterpolator( gridData=None, interpolation="cubic" ):
+
+    # ------------------------------------------------- #
+    # --- [1] grid geometry & cell coefficients     --- #
+    # ------------------------------------------------- #
+    #  -- gridData :: (LJ,LI,3), x along LI, y along LJ  --  #
+    ret         = geometry__grid( gridData=gridData )
+    ret["interpolation"] = interpolation
+    ret["coef"]          = coefficients__grid( fval=gridData[:,:,2], interpolation=interpolation )
+    return( ret )
+
+
+# ========================================================= #
+# ===  geometry of equi-spaced grid                     === #
+# ========================================================= #
+
+def geometry__grid( gridData=None ):
+
+    #  -- gridData :: (LJ,LI,3), x along LI, y along LJ  --  #
+    x_, y_      = 0, 1
+    LJ, LI      = gridData.shape[0], gridData.shape[1]
+    x0, y0      = gridData[0,0,x_], gridData[0,0,y_]
+    dx          = ( gridData[0,-1,x_] - x0 ) / ( LI-1 )
+    dy          = ( gridData[-1,0,y_] - y0 ) / ( LJ-1 )
+    return( { "x0":x0, "y0":y0, "dx":dx, "dy":dy, "LI":LI, "LJ":LJ } )
+
+
+# ========================================================= #
+# ===  cell coefficients ( fval :: (...,LJ,LI) )        === #
+# ========================================================= #
+
+def coefficients__grid( fval=None, interpolation="cubic" ):
+
+    #  -- leading axes of fval are kept :: stack of grids allowed  --  #
+    fval        = np.asarray( fval, dtype=np.float64 )
+    if   ( interpolation == "linear" ):
+        #  -- corner values (...,LJ-1,LI-1,2,2) [a,b] :: x-index a, y-index b  --  #
+        coef            = np.zeros( fval.shape[:-2] + ( fval.shape[-2]-1, fval.shape[-1]-1, 2, 2 ) )
+        coef[...,0,0]   = fval[...,:-1,:-1]
+        coef[...,1,0]   = fval[...,:-1,1: ] - fval[...,:-1,:-1]
+        coef[...,0,1]   = fval[...,1: ,:-1] - fval[...,:-1,:-1]
+        coef[...,1,1]   = fval[...,1: ,1: ] - fval[...,1: ,:-1] - fval[...,:-1,1: ] + fval[...,:-1,:-1]
+    elif ( interpolation == "cubic"  ):
+        #  -- derivatives in local ( cell-normalized ) coordinate --  #
+        fy, fx          = np.gradient( fval, axis=(-2,-1), edge_order=2 )
+        fxy             = np.gradient( fx, axis=-2, edge_order=2 )
+        #  -- F[a,b] :: ( f, f_u ) x ( f, f_v ) at 4 corners     --  #
+        F               = np.zeros( fval.shape[:-2] + ( fval.shape[-2]-1, fval.shape[-1]-1, 4, 4 ) )
+        for (a,b),val in zip( [ (0,0),(0,2),(2,0),(2,2) ], [ fval, fy, fx, fxy ] ):
+            F[...,a  ,b  ] = val[...,:-1,:-1]
+            F[...,a  ,b+1] = val[...,1: ,:-1]
+            F[...,a+1,b  ] = val[...,:-1,1: ]
+            F[...,a+1,b+1] = val[...,1: ,1: ]
+        M               = np.array( [ [ 1.0, 0.0, 0.0, 0.0 ], \
+                                      [ 0.0, 0.0, 1.0, 0.0 ], \
+                                      [-3.0, 3.0,-2.0,-1.0 ], \
+                                      [ 2.0,-2.0, 1.0, 1.0 ] ] )
+        coef            = np.einsum( "ai,...il,bl->...ab", M, F, M, optimize=True )
+    else:
+        sys.exit( "[coefficients__grid] interpolation == {0} ??? ".format( interpolation ) )
+    return( np.ascontiguousarray( coef ) )
+
+
+# ========================================================= #
+# ===  evaluate interpolator at points ( batched )      === #
+# ========================================================= #
+
+def evaluate__gridInterpolator( interpolator=None, pointData=None, chunk=2**18 ):
+
+    # ------------------------------------------------- #
+    # --- [1] preparation                           --- #
+    # ------------------------------------------------- #
+    #  -- returns copy of pointData(:,0:3) with interpolated z --  #
+    z_          = 2
+    coef        = interpolator["coef"]
+    ret         = np.array( pointData[:,0:3], dtype=np.float64 )
+
+    # ------------------------------------------------- #
+    # --- [2] cell index by arithmetic ( no search )--- #
+    # ------------------------------------------------- #
+    for i1 in range( 0, ret.shape[0], chunk ):
+        pts   = ret[i1:i1+chunk]
+        loc   = locate__gridPoints( interpolator=interpolator, pointData=pts, order=coef.shape[-1] )
+        pts[:,z_] = np.einsum( "na,nab,nb->n", loc["U"], coef[loc["jy"],loc["ix"]], loc["V"], \
+                               optimize=True )
+    return( ret )
+
+
+# ========================================================= #
+# ===  cell index & local basis of points               === #
+# ========================================================= #
+
+def locate__gridPoints( interpolator=None, pointData=None, order=4 ):
+
+    #  -- points outside grid use the edge cell ( extrapolation ) --  #
+    x_, y_      = 0, 1
+    xi          = ( pointData[:,x_] - interpolator["x0"] ) / interpolator["dx"]
+    yj          = ( pointData[:,y_] - interpolator["y0"] ) / interpolator["dy"]
+    ix          = np.clip( np.floor( xi ).astype( np.int64 ), 0, interpolator["LI"]-2 )
+    jy          = np.clip( np.floor( yj ).astype( np.int64 ), 0, interpolator["LJ"]-2 )
+    u, v        = xi - ix, yj - jy
+    U           = u[:,None] ** np.arange( order )[None,:]
+    V           = v[:,None] ** np.arange( order )[None,:]
+    return( { "ix":ix, "jy":jy, "U":U, "V":V } )
+
+
+# ========================================================= #
+# ===  evaluate a stack of grids at fixed points        === #
+# ========================================================= #
+
+def evaluate__gridStack( fvals=None, located=None, interpolation="cubic", chunk=2**18 ):
+
+    #  -- fvals :: (C,LJ,LI) z of C grids on a common (x,y) grid   --  #
+    #  -- located :: from locate__gridPoints ( computed once )     --  #
+    #  -- returns (C,N) z at the located points                    --  #
+    #  -- chunk :: ( grids x points ) per gather, bounds memory as  --  #
+    #  --          evaluate__gridInterpolator does                  --  #
+    coef        = coefficients__grid( fval=fvals, interpolation=interpolation )
+    nPoints     = located["ix"].shape[0]
+    step        = max( 1, chunk // coef.shape[0] )
+    ret         = np.empty( ( coef.shape[0], nPoints ), dtype=np.float64 )
+    for i1 in range( 0, nPoints, step ):
+        i2            = min( i1+step, nPoints )
+        cell          = coef[:,located["jy"][i1:i2],located["ix"][i1:i2]]
+        ret[:,i1:i2]  = np.einsum( "na,cnab,nb->cn", located["U"][i1:i2], cell, \
+                                   located["V"][i1:i2], optimize=True )
+    return( ret )
@@ -1,25 +1,36 @@
-import os, sys
+import os, sys, time
 import gmsh
 import numpy   as np
+import profile__stages as prf
 
 # ========================================================= #
 # ===  make__magnet routine                             === #
 # ========================================================= #
 
-def make__magnet():
+def make__magnet( const=None, inpDir="dat", outDir="msh", meshFile=None ):
 
     # ------------------------------------------------- #
     # --- [1] load config                           --- #
     # ------------------------------------------------- #
-    cnsFile = "dat/parameter.conf"
-    import nkUtilities.load__constants as lcn
-    const   = lcn.load__constants( inpFile=cnsFile )
+    #  -- const :: given dict, or inpDir/parameter.conf --  #
+    time0   = time.perf_counter()
+    if ( const is None ):
+        cnsFile = os.path.join( inpDir, "parameter.conf" )
+        import nkUtilities.load__constants as lcn
+        const   = lcn.load__constants( inpFile=cnsFile )
+    const   = dict( const )
     side    = const["geometry.side"]
+    os.makedirs( outDir, exist_ok=True )
+    prf.init__profiler( enabled=const["run.profile"], start=time0 )
+    prf.record__stage( "[1] config load", count=False )
 
     
     # ------------------------------------------------- #
     # --- [2] initialization of the gmsh            --- #
     # ------------------------------------------------- #
+    #  -- a session left by a failed run ( model, options ) is dropped first --  #
+    if ( gmsh.isInitialized() ):
+        gmsh.finalize()
     gmsh.initialize()
     gmsh.option.setNumber( "General.Terminal", 1 )
     gmsh.option.setNumber( "Geometry.ToleranceBoolean", 1e-3 )
@@ -27,86 +38,144 @@ def make__magnet():
     gmsh.option.setNumber( "Mesh.Algorithm3D", const["mesh.algorithm3D"] )
     gmsh.option.setNumber( "Mesh.SubdivisionAlgorithm", const["mesh.subdivision"] )
     gmsh.model.add( "model" )
+    prf.record__stage( "[2] gmsh initialize" )
 
     
     # ------------------------------------------------- #
     # --- [3] Modeling                              --- #
     # ------------------------------------------------- #
+    #  -- dedup    :: removeAllDuplicates within the parts, then the final fragment --  #
+    #  -- fragment :: one occ.fragment of all parts only                         --  #
+    #  -- port_cache :: port-free model is reused if only ports.conf changed --  #
+    #  -- mapping    :: part name ( <region>_<side> ) -> volume tags, carried    --  #
+    #  --               through fragments by outDimTagsMap, and through STEP     --  #
+    #  --               files by signatures ( <stpFile>.parts )                  --  #
+    import assemble__parts as apt
+    parts   = []
+    mapping = {}
+    woport  = None
+    if ( const["geometry.add_port"] and const["geometry.port_cache"] ):
+        import define__ports as dfp
+        portKey = dfp.key__portFree( const=const, inpDir=inpDir )
+        woport  = dfp.lookup__portFree( key=portKey, stpFile=os.path.join( outDir, "model_woport.step" ) )
     if ( const["geometry.import_model"] ):
-        stpFile = "msh/model.step"
+        stpFile = os.path.join( outDir, "model.step" )
         gmsh.model.occ.importShapes( stpFile )
+        parts   = restore__names( stpFile=stpFile )
         const["geometry.save_step"] = False
+    elif ( woport is not None ):
+        gmsh.model.occ.importShapes( woport )
+        parts   = restore__names( stpFile=woport )
     else:
         import generate__magnetParts as mag
-        mag.generate__magnetParts( side=side )
-        
-    gmsh.model.occ.synchronize()
-    gmsh.model.occ.removeAllDuplicates()
-    gmsh.model.occ.synchronize()
+        parts   = mag.generate__magnetParts( side=side, const=const, inpDir=inpDir, outDir=outDir )
+
+    if ( len( parts ) > 0 ):
+        mapping = apt.assemble__parts( parts=parts, outFile=os.path.join( outDir, "parts.dat" ) )
+    else:
+        gmsh.model.occ.synchronize()
+        gmsh.model.occ.removeAllDuplicates()
+        gmsh.model.occ.synchronize()
+    prf.record__stage( "[3] modeling" )
 
     # ------------------------------------------------- #
     # --- [4] define port                           --- #
     # ------------------------------------------------- #
     if ( const["geometry.add_port"] ):
         # -- [4-1] save wo port model               --  #
-        gmsh.write( "msh/model_woport.step" )
-        # -- [4-2] define ports                     --  #
-        import nkGmshRoutines.define__ports as dfp
-        inpFile      = "dat/ports.conf"
+        import define__ports as dfp
+        if ( woport is None ):
+            portKey  = dfp.key__portFree( const=const, inpDir=inpDir )
+            dfp.store__portFree( key=portKey, stpFile=os.path.join( outDir, "model_woport.step" ), \
+                                 mapping=mapping )
+        # -- [4-2] define ports ( batched placement ) -- #
+        inpFile      = os.path.join( inpDir, "ports.conf" )
         portNums     = dfp.define__ports( inpFile=inpFile )
-        gmsh.model.occ.synchronize()
-        # -- [4-3] boolean cut from yoke            --  #
-        tools        = [ (3,tool  ) for tool   in portNums                 ]
-        targets      = [ (3,target) for target in const["geometry.yoke_tobecut"] ]
-        copy         = gmsh.model.occ.copy( targets )
-        yoke_p       = gmsh.model.occ.cut ( targets, tools, removeObject=True, removeTool=False )
-        holes        = gmsh.model.occ.intersect( tools, copy, removeObject=True, removeTool=False )
-        gmsh.model.occ.synchronize()
-        gmsh.model.occ.removeAllDuplicates()
-        gmsh.model.occ.synchronize()
-        gmsh.write( "msh/model.geo_unrolled" )
+        # -- [4-3] targets :: list, or volumes overlapping ports -- #
+        if ( const["geometry.port_targets"] == "list" ):
+            targets  = const["geometry.yoke_tobecut"]
+        else:
+            targets  = dfp.find__portTargets( tools=portNums, mapping=mapping, \
+                                              select=const["geometry.port_targets"], \
+                                              fallback=const["geometry.yoke_tobecut"] )
+        # -- [4-4] cut & holes by one fragment      --  #
+        pieces       = dfp.cut__ports( targets=targets, tools=portNums )
+        # -- [4-5] names :: cut pieces keep the target's, holes are port_region -- #
+        mapping      = { name:[ piece for tag in tags for piece in pieces["pieces"].get( tag, [tag] ) ] \
+                         for name,tags in mapping.items() }
+        if ( ( len( mapping ) > 0 ) and ( len( pieces["holes"] ) > 0 ) ):
+            mapping[ "{0}_port".format( const["geometry.port_region"] ) ] = pieces["holes"]
+        if ( len( mapping ) > 0 ):
+            mapping  = apt.fragment__mapping( mapping=mapping )
+        else:
+            gmsh.model.occ.synchronize()
+            gmsh.model.occ.removeAllDuplicates()
+            gmsh.model.occ.synchronize()
+        gmsh.write( os.path.join( outDir, "model.geo_unrolled" ) )
+        prf.record__stage( "[4] ports" )
 
     # ------------------------------------------------- #
     # --- [4] save model                            --- #
     # ------------------------------------------------- #
     if ( const["geometry.save_step"] ):
-        gmsh.write( "msh/model.step" )
+        gmsh.write( os.path.join( outDir, "model.step" ) )
+        if ( len( mapping ) > 0 ):
+            apt.write__signatures( apt.sign__mapping( mapping ), os.path.join( outDir, "model.step.parts" ) )
+        prf.record__stage( "[4] save step" )
 
         
     # ------------------------------------------------- #
     # --- [5] Mesh settings                         --- #
     # ------------------------------------------------- #
-    meshFile = "dat/mesh.conf"
+    if ( meshFile is None ):
+        meshFile = os.path.join( inpDir, "mesh.conf" )
     if   ( side == "+" ):
-        physFile = "dat/phys_right.conf"
+        physFile = os.path.join( inpDir, "phys_right.conf" )
     elif ( side == "-" ):
-        physFile = "dat/phys_left.conf"
+        physFile = os.path.join( inpDir, "phys_left.conf"  )
     elif ( side in ["+-","-+"] ):
-        physFile = "dat/phys_both.conf"
+        physFile = os.path.join( inpDir, "phys_both.conf"  )
     else:
         sys.exit( "[make__magnet.py] side == {0} ??? ".format( side ) )
+    #  -- name :: physical table from part names ( independent of entity order ) --  #
+    if ( const["mesh.physical"] == "name" ):
+        if ( len( mapping ) > 0 ):
+            physFile = apt.write__physTable( mapping=mapping, meshFile=meshFile, \
+                                             outFile=os.path.join( outDir, "phys_named.conf" ) )
+        else:
+            print( "[make__magnet.py] no part names, physical groups from {0}".format( physFile ) )
+    elif ( len( mapping ) > 0 ):
+        #  -- table :: entity numbers of phys_*.conf are checked against the part names --  #
+        apt.check__physTable( mapping=mapping, physFile=physFile, meshFile=meshFile )
 
     if ( const["mesh.uniform"] ):
         gmsh.option.setNumber( "Mesh.CharacteristicLengthMin", 0.3 )
         gmsh.option.setNumber( "Mesh.CharacteristicLengthMax", 0.3 )
+    elif ( const["mesh.sizing"] == "field" ):
+        import assign__meshField as amf
+        meshes = amf.assign__meshField( meshFile=meshFile, physFile=physFile, \
+                                        grading=const["mesh.grading"] )
     else:
         import nkGmshRoutines.assign__meshsize as ams
         meshes = ams.assign__meshsize( meshFile=meshFile, physFile=physFile )
 
+    #  -- topology snapshot ( built once, after physical groups ) --  #
+    topo = None
+    if ( const["mesh.compound"] or const["mesh.recombine"] or ( const["mesh.subdivision"] == 2 ) ):
+        import build__topology as btp
+        topo            = btp.build__topology()
     if ( const["mesh.compound"] ):
-        surfDim,voluDim = 2, 3
+        #  -- common surfaces of gap & pole --  #
+        surfDim         = 2
         physNum_gap     = 301
         physNum_pole    = 302
-        volu_gap        = gmsh.model.getEntitiesForPhysicalGroup( 3, physNum_gap  )
-        volu_pole       = gmsh.model.getEntitiesForPhysicalGroup( 3, physNum_pole )
-        dimtag_gap      = [ (voluDim,vnum) for vnum in volu_gap  ]
-        dimtag_pole     = [ (voluDim,vnum) for vnum in volu_pole ]
-        surf_gap        = gmsh.model.getBoundary( dimtag_gap  )
-        surf_pole       = gmsh.model.getBoundary( dimtag_pole )
-        surf_gap        = [ dimtag[1] for dimtag in surf_gap  ]
-        surf_pole       = [ dimtag[1] for dimtag in surf_pole ]
-        surf_common     = list( set( surf_gap ) & set( surf_pole ) )
-        gmsh.model.mesh.setCompound( surfDim, surf_common )
+        surf_common     = btp.common__boundary( topo, physNum1=physNum_gap, physNum2=physNum_pole )
+        gmsh.model.mesh.setCompound( surfDim, [ int( surf ) for surf in surf_common ] )
+    if ( const["mesh.recombine"] or ( const["mesh.subdivision"] == 2 ) ):
+        #  -- hexa / prism on volumes of that topology, tetra elsewhere --  #
+        import assign__transfinite as atf
+        atf.assign__transfinite( meshFile=meshFile, topo=topo, recombine=const["mesh.recombine"] )
+    prf.record__stage( "[5] mesh sizing" )
 
         
     # ------------------------------------------------- #
@@ -115,28 +184,54 @@ def make__magnet():
     #  -- [6-1] meshing                             --  #
     gmsh.model.occ.synchronize()
     gmsh.model.mesh.generate(3)
+    prf.record__stage( "[6-1] mesh generate(3)" )
 
     #  -- [6-2] optimization                        --  #
     if ( const["mesh.optimize"] ):
         gmsh.option.setNumber( "Mesh.OptimizeThreshold", const["mesh.opt_threshold"] )
         gmsh.model.mesh.optimize( "Netgen" )
         gmsh.model.mesh.optimize( "Relocate3D" )
+        prf.record__stage( "[6-2] mesh optimize" )
     
     #  -- [6-3] save mesh                           --  #
     gmsh.option.setNumber( "Mesh.SaveElementTagType", 2 )
     gmsh.option.setNumber( "Mesh.BdfFieldFormat"    , 0 )
+    outFiles = []
     if ( const["mesh.save_bdf"] ):
-        gmsh.write( "msh/model.bdf" )
+        outFiles.append( os.path.join( outDir, "model.bdf" ) )
+        gmsh.write( outFiles[-1] )
     if ( const["mesh.save_msh"] ):
-        gmsh.write( "msh/model.msh" )
+        outFiles.append( os.path.join( outDir, "model.msh" ) )
+        gmsh.write( outFiles[-1] )
+    prf.record__stage( "[6-3] write mesh" )
 
 
     # ------------------------------------------------- #
     # --- [7] post-process                          --- #
     # ------------------------------------------------- #
+    prf.write__profile( outDir=outDir )
+    nNodes   = len( gmsh.model.mesh.getNodes()[0] )
+    nElems   = int( sum( [ len( tags ) for tags in gmsh.model.mesh.getElements( dim=3 )[1] ] ) )
     gmsh.finalize()
-    return()
+    ret      = { "nNodes":nNodes, "nElems":nElems, "outFiles":outFiles }
+    return( ret )
+
+
+
+# ========================================================= #
+# ===  part names of an imported STEP file              === #
+# ========================================================= #
+def restore__names( stpFile=None ):
 
+    #  -- [] :: no <stpFile>.parts ( physical groups from phys_*.conf ) --  #
+    import assemble__parts as apt
+    signs   = apt.load__signatures( stpFile + ".parts" )
+    if ( signs is None ):
+        return( [] )
+    mapping = apt.match__mapping( signs )
+    if ( "others" in mapping ):
+        sys.exit( "[make__magnet.py] volumes {0} of {1} not in {1}.parts ??? ".format( mapping["others"], stpFile ) )
+    return( list( mapping.items() ) )
 
 
 # ========================================================= #
@@ -1,5 +1,5 @@
 import numpy   as np
-import os, sys, subprocess
+import os, sys
 import gmsh
 
 
@@ -18,43 +18,111 @@ def make__poleSurface():
     lc2     = const["geometry.pole_lc_bot"]
     radius  = const["geometry.r_pole"]
     side    = const["geometry.side"]
+    save_elmer = const["mesh.save_elmer"]
+    dataFormat = const["data.format"]
+    incremental= const["geometry.pole_incremental"]
+    plot       = const["run.plot"]
+    sizing     = { "mode"     :const["geometry.pole_sizing"], \
+                   "lc_min"   :const["geometry.pole_lc_min"], \
+                   "lc_max"   :const["geometry.pole_lc_max"], \
+                   "tolerance":const["geometry.pole_tolerance"] }
 
     # ------------------------------------------------- #
     # --- [2] interpolation / gmsh <-> elmer        --- #
     # ------------------------------------------------- #
-    nop     = True
-    
+    passes  = []
     if ( side in ["+","+-","-+"] ):
-        generate__mesh_to_interpolate( lc1=lc1, lc2=lc2, radius=radius, side="+" )
-        convert__meshFormat( direction="gmsh->elmer" )
-        ret     = interpolate__grid_to_mesh( side="+" )
-        nop     = False
-
+        passes.append( "+"  )
     if ( side in ["-","+-","-+"] ):
-        generate__mesh_to_interpolate( lc1=lc1, lc2=lc2, radius=radius, side="-" )
-        convert__meshFormat( direction="gmsh->elmer" )
-        ret     = interpolate__grid_to_mesh( side="-" )
-        nop     = False
-
+        passes.append( "-"  )
     if ( side in ["+-","-+"]     ):
-        generate__mesh_to_interpolate( lc1=lc1, lc2=lc2, radius=radius, side="+-" )
-        convert__meshFormat( direction="gmsh->elmer" )
-        ret     = interpolate__grid_to_mesh( side="+-" )
-        nop     = False
+        passes.append( "+-" )
 
-    if ( nop ):
-        print( "[make__poleSurface.py] no Operation !!! ERROR !!! " )
+    #  -- the last pass is pushed back into gmsh ( mesh3d ) --  #
+    #  -- interpolator of the grid is built only once for all passes --  #
+    kwargs  = { "lc1":lc1, "lc2":lc2, "radius":radius, "side":side, \
+                "save_elmer":save_elmer, "dataFormat":dataFormat, \
+                "interpolator":load__gridInterpolator(), "incremental":incremental, \
+                "sizing":sizing }
+    finals  = [ ( ik == len( passes )-1 ) for ik in range( len( passes ) ) ]
+    if ( const["run.parallel"] and ( len( passes ) > 1 ) ):
+        import multiprocessing, concurrent.futures
+        context = multiprocessing.get_context( "spawn" )
+        with concurrent.futures.ProcessPoolExecutor( max_workers=len( passes ), \
+                                                     mp_context=context ) as pool:
+            jobs = [ pool.submit( run__interpolationPass, pside=pside, final=final, \
+                                  mshFile=mesh2dFile( side=pside ), **kwargs ) \
+                     for pside,final in zip( passes, finals ) ]
+            for job in jobs:
+                job.result()
     else:
-        convert__meshFormat( direction="elmer->gmsh", side=side )
+        for pside,final in zip( passes, finals ):
+            run__interpolationPass( pside=pside, final=final, **kwargs )
+
+    if ( len( passes ) == 0 ):
+        print( "[make__poleSurface.py] no Operation !!! ERROR !!! " )
+
+    # ------------------------------------------------- #
+    # --- [3] post-process :: figure ( opt-in )     --- #
+    # ------------------------------------------------- #
+    if ( plot and ( len( passes ) > 0 ) ):
+        plot__onmesh( side=passes[-1] )
 
     return()
 
 
+# ========================================================= #
+# ===  one pass :: mesh -> interpolate ( own session )  === #
+# ========================================================= #
+def run__interpolationPass( pside="+", lc1=0.0, lc2=0.0, radius=1.0, side="+", final=False, \
+                            save_elmer=False, dataFormat="text", interpolator=None, \
+                            incremental=False, sizing=None, mshFile="msh/mesh2d.msh" ):
+
+    # ------------------------------------------------- #
+    # --- [1] incremental :: re-interpolate z only  --- #
+    # ------------------------------------------------- #
+    #  -- same lc / radius / side / sizing => stored 2D mesh, no gmsh re-meshing --  #
+    #  -- curvature sizing depends on the shape itself :: always re-mesh         --  #
+    #  -- final pass :: mesh3d is rebuilt from the stored mesh                     --  #
+    if ( sizing is None ):
+        sizing    = { "mode":"uniform" }
+    signature = signature__mesh( lc1=lc1, lc2=lc2, radius=radius, side=pside, \
+                                 sizing=sizing, interpolator=interpolator )
+    if ( incremental and ( sizing["mode"] == "uniform" ) ):
+        mesh  = load__storedMesh( signature=signature )
+        if ( mesh is not None ):
+            ret = interpolate__grid_to_mesh( side=pside, mesh=mesh, dataFormat=dataFormat, \
+                                             interpolator=interpolator, save_elements=False )
+            if ( final ):
+                build__meshModel( mesh=mesh )
+                convert__meshFormat( direction="elmer->gmsh", side=side, mesh=mesh, \
+                                     save_elmer=save_elmer )
+                gmsh.finalize()
+            return( pside )
+
+    # ------------------------------------------------- #
+    # --- [2] mesh -> interpolate -> ( mesh3d )     --- #
+    # ------------------------------------------------- #
+    generate__mesh_to_interpolate( lc1=lc1, lc2=lc2, radius=radius, side=pside, \
+                                   sizing=sizing, interpolator=interpolator, mshFile=mshFile )
+    mesh    = convert__meshFormat( direction="gmsh->elmer", save_elmer=( save_elmer and final ) )
+    report__meshAccuracy( mesh=mesh, interpolator=interpolator, side=pside, mode=sizing["mode"] )
+    store__mesh( mesh=mesh, signature=signature )
+    ret     = interpolate__grid_to_mesh( side=pside, mesh=mesh, dataFormat=dataFormat, \
+                                         interpolator=interpolator )
+    if ( final ):
+        convert__meshFormat( direction="elmer->gmsh", side=side, mesh=mesh, \
+                             save_elmer=save_elmer )
+    gmsh.finalize()
+    return( pside )
+
+
 # ========================================================= #
 # ===   generate__mesh_to_interpolate                   === #
 # ========================================================= #
 
-def generate__mesh_to_interpolate( lc1=0.0, lc2=0.0, radius=1.0, side="+" ):
+def generate__mesh_to_interpolate( lc1=0.0, lc2=0.0, radius=1.0, side="+", sizing=None, \
+                                   interpolator=None, mshFile="msh/mesh2d.msh" ):
 
     # ------------------------------------------------- #
     # --- [1] initialization of the gmsh            --- #
@@ -95,19 +163,116 @@ def generate__mesh_to_interpolate( lc1=0.0, lc2=0.0, radius=1.0, side="+" ):
     gmsh.model.occ.synchronize()
     
     # ------------------------------------------------- #
-    # --- [3] Mesh generation & save                --- #
+    # --- [3] background size field ( curvature )   --- #
+    # ------------------------------------------------- #
+    if ( ( sizing is not None ) and ( sizing["mode"] == "curvature" ) ):
+        set__curvatureField( interpolator=interpolator, lc_min=sizing["lc_min"], \
+                             lc_max=sizing["lc_max"], tolerance=sizing["tolerance"] )
+    elif ( ( sizing is not None ) and ( sizing["mode"] != "uniform" ) ):
+        sys.exit( "[generate__mesh_to_interpolate] sizing == {0} ??? ( uniform, curvature ) ".format( sizing["mode"] ) )
+
+    # ------------------------------------------------- #
+    # --- [4] Mesh generation & save                --- #
     # ------------------------------------------------- #
+    #  -- gmsh session is kept open for convert__meshFormat --  #
     gmsh.model.occ.synchronize()
     gmsh.model.mesh.generate(2)
-    gmsh.write( "msh/mesh2d.msh" )
-    gmsh.finalize()
+    gmsh.write( mshFile )
+
+
+# ========================================================= #
+# ===  2D mesh file of a parallel pass                  === #
+# ========================================================= #
+def mesh2dFile( side="+" ):
+    #  -- parallel passes must not share msh/mesh2d.msh --  #
+    names   = { "+":"right", "-":"left", "+-":"both", "-+":"both" }
+    return( "msh/mesh2d_{0}.msh".format( names[side] ) )
 
 
     
 # ========================================================= #
-# === convert mesh into easy-to-read format using Elmer === #
+# ===  background size field from surface curvature     === #
 # ========================================================= #
-def convert__meshFormat( direction=None, side="+" ):
+def set__curvatureField( interpolator=None, lc_min=0.01, lc_max=0.2, tolerance=1.0e-4 ):
+
+    # ------------------------------------------------- #
+    # --- [1] Hessian of each grid cell             --- #
+    # ------------------------------------------------- #
+    #  -- from bicubic coefficients at cell origin ( u=v=0 ) --  #
+    #  -- linear error on a triangle ~ h^2 |kappa| / 8 = tolerance  --  #
+    coef    = interpolator["coef"]
+    dx, dy  = interpolator["dx"], interpolator["dy"]
+    if ( coef.shape[-1] > 2 ):
+        fxx = 2.0 * coef[...,2,0] / dx**2
+        fyy = 2.0 * coef[...,0,2] / dy**2
+    else:
+        fxx = fyy = np.zeros( coef.shape[0:2] )
+    fxy     = coef[...,1,1] / ( dx*dy )
+    kappa   = np.abs( 0.5*( fxx+fyy ) ) + np.sqrt( ( 0.5*( fxx-fyy ) )**2 + fxy**2 )
+    size    = np.sqrt( 8.0 * tolerance / np.maximum( kappa, 1.0e-30 ) )
+    size    = np.clip( size, lc_min, lc_max )
+
+    # ------------------------------------------------- #
+    # --- [2] size view :: 2 triangles per grid cell--- #
+    # ------------------------------------------------- #
+    LJ, LI  = interpolator["LJ"], interpolator["LI"]
+    xc      = interpolator["x0"] + dx*np.arange( LI )
+    yc      = interpolator["y0"] + dy*np.arange( LJ )
+    X, Y    = np.meshgrid( xc, yc )
+    corners = [ (X[:-1,:-1],Y[:-1,:-1]), (X[:-1,1:],Y[:-1,1:]), \
+                (X[1: ,1: ],Y[1: ,1: ]), (X[1: ,:-1],Y[1: ,:-1]) ]
+    triData = []
+    for i1,i2,i3 in [ (0,1,2), (0,2,3) ]:
+        #  -- ST :: x1 x2 x3 y1 y2 y3 z1 z2 z3 v1 v2 v3  --  #
+        block          = np.zeros( (LJ-1,LI-1,12) )
+        block[...,0:3] = np.stack( [ corners[i][0] for i in (i1,i2,i3) ], axis=-1 )
+        block[...,3:6] = np.stack( [ corners[i][1] for i in (i1,i2,i3) ], axis=-1 )
+        block[...,9: ] = size[...,None]
+        triData.append( np.reshape( block, (-1,12) ) )
+    triData = np.concatenate( triData, axis=0 )
+    view    = gmsh.view.add( "meshsize" )
+    gmsh.view.addListData( view, "ST", triData.shape[0], np.ravel( triData ).tolist() )
+
+    # ------------------------------------------------- #
+    # --- [3] background mesh                       --- #
+    # ------------------------------------------------- #
+    field   = gmsh.model.mesh.field.add( "PostView" )
+    gmsh.model.mesh.field.setNumber( field, "ViewTag", view )
+    gmsh.model.mesh.field.setAsBackgroundMesh( field )
+    gmsh.option.setNumber( "Mesh.MeshSizeExtendFromBoundary", 0 )
+    gmsh.option.setNumber( "Mesh.MeshSizeFromPoints"       , 0 )
+    gmsh.option.setNumber( "Mesh.MeshSizeMin", lc_min )
+    gmsh.option.setNumber( "Mesh.MeshSizeMax", lc_max )
+    return( field )
+
+
+# ========================================================= #
+# ===  triangle count & max. interpolation error        === #
+# ========================================================= #
+def report__meshAccuracy( mesh=None, interpolator=None, side="+", mode="uniform" ):
+
+    #  -- error of linear ( on-mesh ) surface against grid surface, --  #
+    #  -- sampled at centroids & edge midpoints of every triangle   --  #
+    import interpolate__gridInterpolator as igi
+    tri     = mesh["elements"][:,3:6] - 1
+    xyz     = igi.evaluate__gridInterpolator( interpolator=interpolator, \
+                                              pointData=mesh["nodes"][:,2:5] )
+    P       = xyz[tri]
+    samples = [ ( P[:,0]+P[:,1]+P[:,2] ) / 3.0, 0.5*( P[:,0]+P[:,1] ), \
+                0.5*( P[:,1]+P[:,2] ), 0.5*( P[:,2]+P[:,0] ) ]
+    samples = np.concatenate( samples, axis=0 )
+    exact   = igi.evaluate__gridInterpolator( interpolator=interpolator, pointData=samples )
+    error   = np.max( np.abs( exact[:,2] - samples[:,2] ) )
+    ret     = { "nTriangles":tri.shape[0], "maxError":error }
+    print( "[report__meshAccuracy] side={0} sizing={1} :: nTriangles = {2}, maxError = {3:.3e}"\
+           .format( side, mode, ret["nTriangles"], ret["maxError"] ) )
+    return( ret )
+
+
+# ========================================================= #
+# === convert mesh into easy-to-read ( Elmer ) format   === #
+# ========================================================= #
+def convert__meshFormat( direction=None, side="+", mesh=None, save_elmer=False ):
 
     if   ( side == "+" ):
         inpFile = "dat/onmesh_right.dat"
@@ -129,51 +294,140 @@ def convert__meshFormat( direction=None, side="+" ):
     # ------------------------------------------------- #
     if   ( direction.lower() == "gmsh->elmer"  ):
 
-        # -- use ElmerGrid command to convert -- #
+        # -- read nodes / elements from live model -- #
         print()
-        print( "[convert__meshFormat] convert .msh (Gmsh) File into Elmer-Format.... " )
-        cmd = "ElmerGrid 14 2 msh/mesh2d.msh"
-        print( cmd )
-        subprocess.call( cmd.split() )
+        print( "[convert__meshFormat] convert gmsh model into Elmer-Format.... " )
+        mesh = get__meshData()
+        if ( save_elmer ):
+            write__elmerMesh( mesh=mesh, outDir="msh/mesh2d" )
+        return( mesh )
 
     # ------------------------------------------------- #
     # --- [2] elmer -> gmsh mode                    --- #
     # ------------------------------------------------- #
     if   ( direction.lower() == "elmer->gmsh" ):
         
-        # -- copy original Elmer-Format       -- #
         print()
         print( "[reconvert__meshFormat] re-convert Elmer-Format into Gmsh.... " )
-        cmd = "mkdir -p msh/mesh3d"
-        print( cmd )
-        subprocess.call( cmd.split() )
-        cmd = "cp -r msh/mesh2d/* msh/mesh3d/"
-        print( cmd )
-        subprocess.call( cmd, shell=True )
         # -- modify nodes position            -- #
-        import nkUtilities.load__pointFile as lpf
-        nodFile     = "msh/mesh3d/mesh.nodes"
-        nodes       = lpf.load__pointFile( inpFile=inpFile, returnType="point" )
-        mesh        = lpf.load__pointFile( inpFile=nodFile, returnType="point" )
-        mesh[:,2:5] = nodes[:,:]
-        # -- rewrite back into nodFile        -- #
-        fmt         = [ "%d", "%d", "%15.8e", "%15.8e", "%15.8e" ]
-        with open( nodFile, "w" ) as f:
-            np.savetxt( f, mesh, fmt=fmt )
-        # -- reconvert into gmsh Format       -- #
-        os.chdir( "msh/" )
-        cmd = "ElmerGrid 2 4 mesh3d"
-        print( cmd )
-        subprocess.call( cmd.split() )
-        os.chdir( "../" )
+        import manage__pointData as mpd
+        nodes       = mpd.load__pointData( inpFile=inpFile, returnType="point" )
+        mesh["nodes"][:,2:5] = nodes[:,:]
+        # -- push back into the live model ( all nodes, by tag ) -- #
+        for nodeTag,coord in zip( mesh["nodeTags"], mesh["nodes"][:,2:5] ):
+            gmsh.model.mesh.setNode( int( nodeTag ), list( coord ), [] )
+        gmsh.write( "msh/mesh3d.msh" )
+        if ( save_elmer ):
+            write__elmerMesh( mesh=mesh, outDir="msh/mesh3d" )
+        return( mesh )
+
+
+# ========================================================= #
+# ===  get nodes / triangles from live gmsh model       === #
+# ========================================================= #
+def get__meshData():
+
+    # ------------------------------------------------- #
+    # --- [1] nodes ( renumbered as 1,2,...,N )     --- #
+    # ------------------------------------------------- #
+    nodeTags, coord, param = gmsh.model.mesh.getNodes()
+    nodeTags    = np.array( nodeTags, dtype=np.int64 )
+    coord       = np.reshape( np.array( coord ), (-1,3) )
+    order       = np.argsort( nodeTags )
+    nodeTags    = nodeTags[order]
+    nNodes      = nodeTags.shape[0]
+    nodes       = np.zeros( (nNodes,5) )
+    nodes[:,0]  = np.arange( 1, nNodes+1 )
+    nodes[:,1]  = -1
+    nodes[:,2:5]= coord[order]
+    renumber    = lambda tags: np.searchsorted( nodeTags, np.array( tags, dtype=np.int64 ) ) + 1
+
+    # ------------------------------------------------- #
+    # --- [2] triangles ( body = surface entity )   --- #
+    # ------------------------------------------------- #
+    elements    = []
+    for ib,(dim,tag) in enumerate( gmsh.model.getEntities(2) ):
+        elemTags, elemNodes = gmsh.model.mesh.getElementsByType( 2, tag )
+        elemNodes = np.reshape( renumber( elemNodes ), (-1,3) )
+        elem      = np.zeros( (elemNodes.shape[0],6), dtype=np.int64 )
+        elem[:,1] = ib+1
+        elem[:,2] = 303
+        elem[:,3:]= elemNodes
+        elements.append( elem )
+    elements      = np.concatenate( elements, axis=0 )
+    elements[:,0] = np.arange( 1, elements.shape[0]+1 )
+
+    # ------------------------------------------------- #
+    # --- [3] boundary lines ( bc = curve entity )  --- #
+    # ------------------------------------------------- #
+    bcs, lines  = [], []
+    for ib,(dim,tag) in enumerate( gmsh.model.getEntities(1) ):
+        elemTags, elemNodes = gmsh.model.mesh.getElementsByType( 1, tag )
+        lines.append( np.reshape( renumber( elemNodes ), (-1,2) ) )
+        bcs  .append( np.full( ( lines[-1].shape[0], ), ib+1, dtype=np.int64 ) )
+    lines, bcs  = np.concatenate( lines, axis=0 ), np.concatenate( bcs )
+
+    # ------------------------------------------------- #
+    # --- [4] parent elements of boundary lines     --- #
+    # ------------------------------------------------- #
+    import generate__poleLayer as gpl
+    edges       = gpl.build__edgeIndex( connectivities=elements[:,3:]-1 )
+    nEdges      = edges["edge_nodes"].shape[0]
+    #  -- [4-1] edge id of each boundary line       --  #
+    hashing     = lambda e: e[:,0]*( nNodes+1 ) + e[:,1]
+    edge_id     = np.searchsorted( hashing( edges["edge_nodes"] ), \
+                                   hashing( np.sort( lines-1, axis=1 ) ) )
+    #  -- [4-2] ( up to two ) elements of each edge --  #
+    flat        = np.ravel( edges["elem_edges"] )
+    owner       = np.repeat( np.arange( 1, elements.shape[0]+1 ), 3 )
+    order       = np.argsort( flat, kind="stable" )
+    first       = np.searchsorted( flat[order], np.arange( nEdges ) )
+    count       = np.bincount( flat, minlength=nEdges )
+    parents     = np.zeros( (nEdges,2), dtype=np.int64 )
+    parents[:,0]= owner[order][ first ]
+    second      = np.minimum( first+1, flat.shape[0]-1 )
+    parents[:,1]= np.where( count > 1, owner[order][ second ], 0 )
+    #  -- [4-3] id, bc, parent1, parent2, 202, n1, n2  --  #
+    nBound      = lines.shape[0]
+    boundary    = np.zeros( (nBound,7), dtype=np.int64 )
+    boundary[:,0]   = np.arange( 1, nBound+1 )
+    boundary[:,1]   = bcs
+    boundary[:,2:4] = parents[edge_id]
+    boundary[:,4]   = 202
+    boundary[:,5:7] = lines
+
+    ret = { "nodes":nodes, "elements":elements, "boundary":boundary, "nodeTags":nodeTags }
+    return( ret )
+
+
+# ========================================================= #
+# ===  write Elmer-format mesh directory                === #
+# ========================================================= #
+def write__elmerMesh( mesh=None, outDir="msh/mesh2d" ):
+
+    os.makedirs( outDir, exist_ok=True )
+    nNodes, nElems, nBound = [ mesh[key].shape[0] for key in [ "nodes", "elements", "boundary" ] ]
+    # -- header   -- #
+    with open( os.path.join( outDir, "mesh.header" ), "w" ) as f:
+        f.write( "{0} {1} {2}\n".format( nNodes, nElems, nBound ) )
+        f.write( "2\n" )
+        f.write( "202 {0}\n".format( nBound ) )
+        f.write( "303 {0}\n".format( nElems ) )
+    # -- contents -- #
+    fmt = [ "%d", "%d", "%15.8e", "%15.8e", "%15.8e" ]
+    np.savetxt( os.path.join( outDir, "mesh.nodes"    ), mesh["nodes"]   , fmt=fmt  )
+    np.savetxt( os.path.join( outDir, "mesh.elements" ), mesh["elements"], fmt="%d" )
+    np.savetxt( os.path.join( outDir, "mesh.boundary" ), mesh["boundary"], fmt="%d" )
+    print( "[write__elmerMesh] outDir :: {0}".format( outDir ) )
     return()
 
 
 # ========================================================= #
 # ===  interpolate__grid_to_mesh                        === #
 # ========================================================= #
-def interpolate__grid_to_mesh( gridFile="dat/mshape_svd.dat", meshFile="msh/mesh2d/mesh.nodes", \
-                               side="+", interpolation="cubic" ):
+def interpolate__grid_to_mesh( gridFile="dat/mshape_svd.dat", meshFile=None, \
+                               side="+", interpolation="cubic", mesh=None, dataFormat="text", \
+                               interpolator=None, save_elements=True ):
     
     if ( side == "+" ):
         omsFile = "dat/onmesh_right.dat"
@@ -188,42 +442,241 @@ def interpolate__grid_to_mesh( gridFile="dat/mshape_svd.dat", meshFile="msh/mesh
     # ------------------------------------------------- #
     # --- [1] load grid & mesh Data                 --- #
     # ------------------------------------------------- #
-    import nkUtilities.load__pointFile as lpf
-    grid      = lpf.load__pointFile( inpFile=gridFile, returnType="structured" )
-    mesh      = lpf.load__pointFile( inpFile=meshFile, returnType="point"      )
-    gridData  = grid[0,:,:,0:3]
-    meshData  = mesh[:,2:5]
+    #  -- mesh :: from convert__meshFormat, or load__meshFile ( stored mesh of side ) --  #
+    #  -- interpolator :: built once per grid ( load__gridInterpolator ) --  #
+    import manage__pointData           as mpd
+    if ( interpolator is None ):
+        interpolator = load__gridInterpolator( gridFile=gridFile, interpolation=interpolation )
+    if ( mesh is None ):
+        mesh      = load__meshFile( meshFile=meshFile, side=side )
+    meshData  = mesh["nodes"][:,2:5]
 
     # ------------------------------------------------- #
     # --- [2] interpolation 2D                      --- #
     # ------------------------------------------------- #
-    if   ( interpolation == "linear" ):
-        import nkInterpolator.interpolate__linear2D as li2
-        ret       = li2.interpolate__linear2D( gridData=gridData, pointData=meshData )
-    elif ( interpolation == "cubic"  ):
-        import nkInterpolator.interpolate__bicubic  as bic
-        ret       = bic.interpolate__bicubic( gridData=gridData, pointData=meshData )
+    import interpolate__gridInterpolator as igi
+    ret       = igi.evaluate__gridInterpolator( interpolator=interpolator, pointData=meshData )
         
     # ------------------------------------------------- #
     # --- [3] save in a File                        --- #
     # ------------------------------------------------- #
     #  -- [3-1] saving data                         --  #
-    import nkUtilities.save__pointFile as spf
-    spf.save__pointFile( outFile=omsFile, Data=ret )
-    #  -- [3-2] copy mesh.elements                  --  #
-    cmd       = "cp msh/mesh2d/mesh.elements {0}".format( elmFile )
-    print( "\n" + "[make__poleSurface] copy mesh.elements... " )
-    print( cmd + "\n" )
-    subprocess.call( cmd, shell=True )
-    
-    #  -- [3-3] save figure                         --  #
-    import nkUtilities.cMapTri as cmt
-    pngFile = "png/onmesh.png"
-    cmt.cMapTri( xAxis=ret[:,0], yAxis=ret[:,1], cMap=ret[:,2], pngFile=pngFile  )
+    mpd.save__pointData( outFile=omsFile, Data=ret, dataFormat=dataFormat )
+    #  -- [3-2] save mesh.elements ( unchanged in incremental mode ) --  #
+    exists    = os.path.exists( elmFile ) or os.path.exists( mpd.binaryFile( elmFile ) )
+    if ( save_elements or not( exists ) ):
+        print( "\n" + "[make__poleSurface] save mesh.elements... " )
+        print( "outFile :: {0}".format( elmFile ) + "\n" )
+        mpd.save__elementData( outFile=elmFile, Data=mesh["elements"], dataFormat=dataFormat )
     
     return( ret )
 
 
+# ========================================================= #
+# ===  plot interpolated surface ( post-process )       === #
+# ========================================================= #
+def plot__onmesh( side="+", pngFile="png/onmesh.png" ):
+    #  -- plotting modules are imported only here --  #
+    import manage__pointData   as mpd
+    import nkUtilities.cMapTri as cmt
+    names   = { "+":"right", "-":"left", "+-":"both", "-+":"both" }
+    omsFile = "dat/onmesh_{0}.dat".format( names[side] )
+    Data    = mpd.load__pointData( inpFile=omsFile, returnType="point" )
+    os.makedirs( os.path.dirname( pngFile ), exist_ok=True )
+    cmt.cMapTri( xAxis=Data[:,0], yAxis=Data[:,1], cMap=Data[:,2], pngFile=pngFile )
+    return( pngFile )
+
+
+# ========================================================= #
+# ===  interpolate many candidate grids on one mesh     === #
+# ========================================================= #
+def interpolate__candidates( candidates=None, meshFile=None, side="+", \
+                             interpolation="cubic", mesh=None, batch=16 ):
+
+    # ------------------------------------------------- #
+    # --- [1] mesh nodes ( fixed for all candidates )--- #
+    # ------------------------------------------------- #
+    #  -- candidates :: stacked array (C,(1,)LJ,LI,3+), or iterable of  --  #
+    #  --               grids / grid file names ( mshape_svd.dat style ) --  #
+    #  -- yields (N,3) onmesh array per candidate, in order              --  #
+    #  -- mesh :: given, or load__meshFile ( stored mesh of side )        --  #
+    import manage__pointData             as mpd
+    import interpolate__gridInterpolator as igi
+    if ( mesh is None ):
+        mesh     = load__meshFile( meshFile=meshFile, side=side )
+    meshData     = np.array( mesh["nodes"][:,2:5], dtype=np.float64 )
+    located      = None
+
+    # ------------------------------------------------- #
+    # --- [2] interpolate in batches                --- #
+    # ------------------------------------------------- #
+    #  -- cell index & basis are computed once ( common x,y grid )  --  #
+    def flush( stack ):
+        fvals = np.array( [ grid[:,:,2] for grid in stack ] )
+        zvals = igi.evaluate__gridStack( fvals=fvals, located=located, interpolation=interpolation )
+        for zval in zvals:
+            ret       = np.copy( meshData )
+            ret[:,2]  = zval
+            yield( ret )
+    stack        = []
+    for grid in candidates:
+        if ( isinstance( grid, str ) ):
+            grid = mpd.load__pointData( inpFile=grid, returnType="structured" )
+        grid     = np.reshape( grid, np.shape( grid )[-3:] )
+        if ( located is None ):
+            geometry = igi.geometry__grid( gridData=grid )
+            located  = igi.locate__gridPoints( interpolator=geometry, pointData=meshData, \
+                                               order=( 4 if interpolation == "cubic" else 2 ) )
+            shape    = grid.shape[0:2]
+            xygrid   = np.array( grid[:,:,0:2], dtype=np.float64 )
+        if ( grid.shape[0:2] != shape ):
+            sys.exit( "[interpolate__candidates] grid shape {0} != {1} ??? ".format( grid.shape, shape ) )
+        if ( not( np.allclose( grid[:,:,0:2], xygrid, rtol=0.0, \
+                               atol=1.e-10*max( 1.0, np.max( np.abs( xygrid ) ) ) ) ) ):
+            sys.exit( "[interpolate__candidates] (x,y) of candidate grid differs from the first one ??? " )
+        stack.append( grid )
+        if ( len( stack ) == batch ):
+            yield from flush( stack )
+            stack = []
+    if ( len( stack ) > 0 ):
+        yield from flush( stack )
+
+
+# ========================================================= #
+# ===  save candidates' onmesh into one binary stack    === #
+# ========================================================= #
+def save__candidates( candidates=None, outFile="dat/onmesh_candidates.npy", nCandidates=None, \
+                      meshFile=None, side="+", interpolation="cubic", \
+                      mesh=None, batch=16 ):
+
+    #  -- (C,N,3) .npy written through memmap ( generator :: give nCandidates ) --  #
+    #  -- written to <outFile>.tmp.npy, renamed only if exactly nCandidates     --  #
+    if ( nCandidates is None ):
+        if ( not( hasattr( candidates, "__len__" ) ) ):
+            sys.exit( "[save__candidates] generator of candidates requires nCandidates ??? " )
+        nCandidates = len( candidates )
+    tmpFile = outFile + ".tmp.npy"
+    stack   = None
+    count   = 0
+    def discard( message ):
+        if ( os.path.exists( tmpFile ) ):
+            os.remove( tmpFile )
+        sys.exit( message )
+    for ik,ret in enumerate( interpolate__candidates( candidates=candidates, meshFile=meshFile, \
+                                                      side=side, interpolation=interpolation, \
+                                                      mesh=mesh, batch=batch ) ):
+        if ( ik >= nCandidates ):
+            del( stack )
+            discard( "[save__candidates] more candidates than nCandidates == {0} ??? ".format( nCandidates ) )
+        if ( stack is None ):
+            stack = np.lib.format.open_memmap( tmpFile, mode="w+", dtype=np.float64, \
+                                               shape=( nCandidates, ) + ret.shape )
+        stack[ik] = ret
+        count     = ik+1
+    if ( stack is not None ):
+        stack.flush()
+        del( stack )
+    if ( count != nCandidates ):
+        discard( "[save__candidates] {0} candidates != nCandidates == {1} ??? ".format( count, nCandidates ) )
+    if ( count > 0 ):
+        os.replace( tmpFile, outFile )
+    print( "[save__candidates] {0} candidates :: outFile :: {1}".format( count, outFile ) )
+    return( outFile )
+
+
+# ========================================================= #
+# ===  store / load 2D mesh for incremental update      === #
+# ========================================================= #
+def storedMeshFile( side="+" ):
+    names   = { "+":"right", "-":"left", "+-":"both", "-+":"both" }
+    return( "msh/mesh2d_{0}.npz".format( names[side] ) )
+
+def signature__mesh( lc1=0.0, lc2=0.0, radius=1.0, side="+", sizing=None, interpolator=None ):
+
+    #  -- values :: lc1, lc2, radius, sizing ( 0:uniform, 1:curvature ), lc_min, lc_max, --  #
+    #  --           tolerance, grid shape & extent ( curvature mesh follows the grid )     --  #
+    values  = [ lc1, lc2, radius ]
+    if ( ( sizing is None ) or ( sizing["mode"] == "uniform" ) ):
+        values += [ 0.0 ] * 10
+    else:
+        values += [ 1.0, sizing["lc_min"], sizing["lc_max"], sizing["tolerance"] ]
+        values += [ interpolator[key] for key in [ "LJ", "LI", "x0", "y0", "dx", "dy" ] ]
+    return( { "side":side, "values":np.array( values, dtype=np.float64 ) } )
+
+def store__mesh( mesh=None, signature=None ):
+    outFile = storedMeshFile( side=signature["side"] )
+    np.savez( outFile, nodes=mesh["nodes"], elements=mesh["elements"], \
+              boundary=mesh["boundary"], nodeTags=mesh["nodeTags"], \
+              signature=signature["values"] )
+    return( outFile )
+
+def build__meshModel( mesh=None ):
+
+    #  -- live gmsh model from a stored mesh :: one discrete surface per body, --  #
+    #  -- one discrete curve per boundary ( node tags of the original model )  --  #
+    gmsh.initialize()
+    gmsh.option.setNumber( "General.Terminal", 1 )
+    gmsh.model.add( "model" )
+    nodeTags  = np.array( mesh["nodeTags"], dtype=np.int64 )
+    elemNodes = nodeTags[ mesh["elements"][:,3:6] - 1 ]
+    lineNodes = nodeTags[ mesh["boundary"][:,5:7] - 1 ]
+    bodies    = np.unique( mesh["elements"][:,1] )
+    for ik,body in enumerate( bodies ):
+        tag   = gmsh.model.addDiscreteEntity( 2 )
+        inc   = ( mesh["elements"][:,1] == body )
+        if ( ik == 0 ):
+            gmsh.model.mesh.addNodes( 2, tag, nodeTags, np.ravel( mesh["nodes"][:,2:5] ) )
+        gmsh.model.mesh.addElementsByType( tag, 2, [], np.ravel( elemNodes[inc] ) )
+    for bc in np.unique( mesh["boundary"][:,1] ):
+        tag   = gmsh.model.addDiscreteEntity( 1 )
+        inc   = ( mesh["boundary"][:,1] == bc )
+        gmsh.model.mesh.addElementsByType( tag, 1, [], np.ravel( lineNodes[inc] ) )
+    return()
+
+def load__meshFile( meshFile=None, side="+" ):
+
+    #  -- meshFile :: None ( stored mesh of side, .npz ), .npz, or Elmer mesh.nodes --  #
+    if ( meshFile is None ):
+        meshFile = storedMeshFile( side=side )
+    if ( not( os.path.exists( meshFile ) ) ):
+        sys.exit( "[load__meshFile] {0} not found ??? ( run make__poleSurface first ) ".format( meshFile ) )
+    if ( meshFile.endswith( ".npz" ) ):
+        with np.load( meshFile ) as f:
+            mesh = { key:f[key] for key in [ "nodes", "elements" ] }
+    else:
+        import nkUtilities.load__pointFile as lpf
+        elmFile_ = os.path.join( os.path.dirname( meshFile ), "mesh.elements" )
+        with open( elmFile_, "r" ) as f:
+            elements = np.array( np.loadtxt( f ), dtype=np.int64 )
+        mesh     = { "nodes"   :lpf.load__pointFile( inpFile=meshFile, returnType="point" ), \
+                     "elements":elements }
+    print( "[load__meshFile] mesh :: {0}".format( meshFile ) )
+    return( mesh )
+
+def load__storedMesh( signature=None ):
+    inpFile = storedMeshFile( side=signature["side"] )
+    if ( not( os.path.exists( inpFile ) ) ):
+        return( None )
+    with np.load( inpFile ) as f:
+        if ( not( np.array_equal( f["signature"], signature["values"] ) ) ):
+            return( None )
+        mesh   = { key:f[key] for key in [ "nodes", "elements", "boundary", "nodeTags" ] }
+    print( "[load__storedMesh] reuse 2D mesh :: {0}".format( inpFile ) )
+    return( mesh )
+
+
+# ========================================================= #
+# ===  load grid & build its interpolator               === #
+# ========================================================= #
+def load__gridInterpolator( gridFile="dat/mshape_svd.dat", interpolation="cubic" ):
+    import manage__pointData             as mpd
+    import interpolate__gridInterpolator as igi
+    grid         = mpd.load__pointData( inpFile=gridFile, returnType="structured" )
+    interpolator = igi.build__gridInterpolator( gridData=grid[0,:,:,0:3], \
+                                                interpolation=interpolation )
+    return( interpolator )
+
+
 # ========================================================= #
 # ===   実行部                                          === #
 # ========================================================= #
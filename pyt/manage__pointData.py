@@ -0,0 +1,133 @@
+import numpy as np
+import os, sys
+
+
+# ========================================================= #
+# ===  binary ( .npy ) file name of a text data file    === #
+# ========================================================= #
+
+def binaryFile( inpFile=None ):
+    return( inpFile + ".npy" )
+
+
+# ========================================================= #
+# ===  choose binary if it is up-to-date                === #
+# ========================================================= #
+
+def use__binary( inpFile=None ):
+
+    binFile = binaryFile( inpFile )
+    if ( not( os.path.exists( binFile ) ) ):
+        return( False )
+    if ( not( os.path.exists( inpFile ) ) ):
+        return( True  )
+    return( os.path.getmtime( binFile ) >= os.path.getmtime( inpFile ) )
+
+
+# ========================================================= #
+# ===  load point data ( .npy memmap or text )          === #
+# ========================================================= #
+
+def load__pointData( inpFile=None, returnType="point" ):
+
+    # ------------------------------------------------- #
+    # --- [1] binary :: memory-mapped .npy          --- #
+    # ------------------------------------------------- #
+    if ( use__binary( inpFile ) ):
+        Data = np.load( binaryFile( inpFile ), mmap_mode="r" )
+        if   ( returnType == "point" ):
+            Data = np.reshape( Data, (-1,Data.shape[-1]) )
+        elif ( returnType == "structured" ):
+            if ( Data.ndim != 4 ):
+                sys.exit( "[load__pointData] {0} is not structured ??? ".format( inpFile ) )
+        return( Data )
+
+    # ------------------------------------------------- #
+    # --- [2] text  :: nkUtilities point file       --- #
+    # ------------------------------------------------- #
+    import nkUtilities.load__pointFile as lpf
+    Data = lpf.load__pointFile( inpFile=inpFile, returnType=returnType )
+    return( Data )
+
+
+# ========================================================= #
+# ===  load element ( connectivity ) data               === #
+# ========================================================= #
+
+def load__elementData( inpFile=None ):
+
+    if ( use__binary( inpFile ) ):
+        Data = np.load( binaryFile( inpFile ), mmap_mode="r" )
+    else:
+        with open( inpFile, "r" ) as f:
+            Data = np.array( np.loadtxt( f ), dtype=np.int64 )
+    return( Data )
+
+
+# ========================================================= #
+# ===  save point data  ( text / npy )                  === #
+# ========================================================= #
+
+def save__pointData( outFile=None, Data=None, dataFormat="text" ):
+
+    if   ( dataFormat == "npy"  ):
+        np.save( binaryFile( outFile ), np.asarray( Data ) )
+    elif ( dataFormat == "text" ):
+        import nkUtilities.save__pointFile as spf
+        spf.save__pointFile( outFile=outFile, Data=Data )
+    else:
+        sys.exit( "[save__pointData] format == {0} ??? ( text, npy ) ".format( dataFormat ) )
+    return()
+
+
+# ========================================================= #
+# ===  save element data ( text / npy )                 === #
+# ========================================================= #
+
+def save__elementData( outFile=None, Data=None, dataFormat="text" ):
+
+    if   ( dataFormat == "npy"  ):
+        np.save( binaryFile( outFile ), np.asarray( Data, dtype=np.int64 ) )
+    elif ( dataFormat == "text" ):
+        np.savetxt( outFile, Data, fmt="%d" )
+    else:
+        sys.exit( "[save__elementData] format == {0} ??? ( text, npy ) ".format( dataFormat ) )
+    return()
+
+
+# ========================================================= #
+# ===  convert existing text files into binary          === #
+# ========================================================= #
+
+def convert__pointData( datDir="dat" ):
+
+    # ------------------------------------------------- #
+    # --- [1] list of intermediate files            --- #
+    # ------------------------------------------------- #
+    import nkUtilities.load__pointFile as lpf
+    structs  = [ "mshape_svd.dat" ]
+    points   = [ "onmesh_right.dat", "onmesh_left.dat", "onmesh_both.dat" ]
+    elements = [ "mesh_right.elements", "mesh_left.elements", "mesh_both.elements" ]
+
+    # ------------------------------------------------- #
+    # --- [2] convert                               --- #
+    # ------------------------------------------------- #
+    for files,returnType in [ (structs,"structured"), (points,"point"), (elements,None) ]:
+        for inpFile in [ os.path.join( datDir, name ) for name in files ]:
+            if ( not( os.path.exists( inpFile ) ) ):
+                continue
+            if ( returnType is None ):
+                with open( inpFile, "r" ) as f:
+                    Data = np.array( np.loadtxt( f ), dtype=np.int64 )
+            else:
+                Data = lpf.load__pointFile( inpFile=inpFile, returnType=returnType )
+            np.save( binaryFile( inpFile ), Data )
+            print( "[convert__pointData] {0} ==> {1}".format( inpFile, binaryFile( inpFile ) ) )
+    return()
+
+
+# ========================================================= #
+# ===   実行部                                          === #
+# ========================================================= #
+if ( __name__=="__main__" ):
+    convert__pointData()
@@ -0,0 +1,110 @@
+import os, sys, shutil, hashlib, tempfile
+
+
+# ========================================================= #
+# ===  cache key of a pole half ( content hash )        === #
+# ========================================================= #
+
+def key__poleCache( side="+", r_pole=None, z_pole=None, z_root=None, inpDir="dat" ):
+
+    # ------------------------------------------------- #
+    # --- [1] input files of the pole half          --- #
+    # ------------------------------------------------- #
+    if   ( side == "+" ):
+        nodFile = os.path.join( inpDir, "onmesh_right.dat" )
+        mshFile = os.path.join( inpDir, "mesh_right.elements" )
+    elif ( side == "-" ):
+        nodFile = os.path.join( inpDir, "onmesh_left.dat"  )
+        mshFile = os.path.join( inpDir, "mesh_left.elements"  )
+    else:
+        print( "[key__poleCache] side == {0} ??? ERROR! ".format( side ) )
+        sys.exit()
+    #  -- the file actually loaded ( text / .npy )  --  #
+    import manage__pointData as mpd
+    inpFiles = [ mpd.binaryFile( inpFile ) if mpd.use__binary( inpFile ) else inpFile \
+                 for inpFile in [ nodFile, mshFile ] ]
+    #  -- code version :: sources of pole builder, region signatures & sectors --  #
+    import nkGmshRoutines.generate__sector180 as sec
+    pyDir    = os.path.dirname( os.path.abspath( __file__ ) )
+    inpFiles = inpFiles + [ os.path.join( pyDir, "generate__poleLayer.py" ), \
+                            os.path.join( pyDir, "assemble__parts.py"     ), \
+                            os.path.abspath( sec.__file__ ) ]
+
+    # ------------------------------------------------- #
+    # --- [2] hash of contents & parameters         --- #
+    # ------------------------------------------------- #
+    sha      = hashlib.sha256()
+    for inpFile in inpFiles:
+        with open( inpFile, "rb" ) as f:
+            for chunk in iter( lambda: f.read( 1 << 20 ), b"" ):
+                sha.update( chunk )
+    sha.update( repr( ( side, float( r_pole ), float( z_pole ), float( z_root ) ) ).encode() )
+    return( sha.hexdigest() )
+
+
+# ========================================================= #
+# ===  look up cached STEP file                         === #
+# ========================================================= #
+
+def lookup__poleCache( key=None, cacheDir="msh/cache" ):
+
+    stpFile = os.path.join( cacheDir, "pole_{0}.step".format( key ) )
+    if ( not( os.path.exists( stpFile ) and os.path.exists( stpFile + ".parts" ) ) ):
+        return( None )
+    #  -- touch for LRU ordering ( may be evicted meanwhile by another worker ) --  #
+    try:
+        os.utime( stpFile, None )
+    except FileNotFoundError:
+        return( None )
+    print( "[lookup__poleCache] cache hit :: {0}".format( stpFile ) )
+    return( stpFile )
+
+
+# ========================================================= #
+# ===  store STEP file & evict least recently used      === #
+# ========================================================= #
+
+def store__poleCache( key=None, stpFile=None, cacheDir="msh/cache", maxSize=16 ):
+
+    # ------------------------------------------------- #
+    # --- [1] store                                 --- #
+    # ------------------------------------------------- #
+    os.makedirs( cacheDir, exist_ok=True )
+    outFile  = os.path.join( cacheDir, "pole_{0}.step".format( key ) )
+    #  -- own temporary file per writer ( workers of a sweep share cacheDir ) --  #
+    #  -- region signatures ( <stpFile>.parts ) travel with the STEP file     --  #
+    pairs    = [ ( stpFile + ".parts", outFile + ".parts" ), ( stpFile, outFile ) ]
+    for srcFile,dstFile in pairs:
+        if ( not( os.path.exists( srcFile ) ) ):
+            continue
+        fd, tmpFile = tempfile.mkstemp( dir=cacheDir, suffix=".tmp" )
+        os.close( fd )
+        shutil.copyfile( srcFile, tmpFile )
+        os.replace( tmpFile, dstFile )
+
+    # ------------------------------------------------- #
+    # --- [2] LRU eviction                          --- #
+    # ------------------------------------------------- #
+    cached   = [ os.path.join( cacheDir, name ) for name in os.listdir( cacheDir ) \
+                 if ( name.startswith( "pole_" ) and name.endswith( ".step" ) ) ]
+    def mtime( name ):
+        try:
+            return( os.path.getmtime( name ) )
+        except FileNotFoundError:
+            return( 0.0 )
+    cached   = sorted( cached, key=mtime, reverse=True )
+    for oldFile in cached[maxSize:]:
+        for name in [ oldFile, oldFile + ".parts" ]:
+            try:
+                os.remove( name )
+            except FileNotFoundError:
+                pass
+        print( "[store__poleCache] evicted :: {0}".format( oldFile ) )
+    #  -- signatures left by an eviction racing a store --  #
+    for name in os.listdir( cacheDir ):
+        if ( name.endswith( ".step.parts" ) and not( os.path.exists( os.path.join( cacheDir, name[:-6] ) ) ) ):
+            try:
+                os.remove( os.path.join( cacheDir, name ) )
+            except FileNotFoundError:
+                pass
+    return( outFile )
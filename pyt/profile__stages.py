@@ -0,0 +1,94 @@
+import os, sys, time, json, resource
+import gmsh
+
+
+# ========================================================= #
+# ===  stage profiler ( module state, like gmsh )       === #
+# ========================================================= #
+#  -- enabled by config ( run.profile ) or env. MAGNET_PROFILE=1 -- #
+
+#  -- time :: start of the current stage, subtime :: last record ( nested sub-steps ) -- #
+
+profiler = { "enabled":False, "records":[], "time":0.0, "subtime":0.0, "start":0.0 }
+
+
+# ========================================================= #
+# ===  initialize profiler                              === #
+# ========================================================= #
+
+def init__profiler( enabled=False, start=None ):
+
+    enabled = bool( enabled ) or ( os.environ.get( "MAGNET_PROFILE", "0" ) not in [ "", "0" ] )
+    if ( start is None ):
+        start = time.perf_counter()
+    profiler["enabled"] = enabled
+    profiler["records"] = []
+    profiler["start"]   = start
+    profiler["time"]    = start
+    profiler["subtime"] = start
+    return( enabled )
+
+
+# ========================================================= #
+# ===  record a stage boundary                          === #
+# ========================================================= #
+
+def record__stage( stage=None, count=True, nested=False ):
+
+    #  -- nested :: sub-step timed from the previous record, the parent stage keeps  --  #
+    #  --           its own timer ( its row spans all of its sub-steps )              --  #
+    if ( not( profiler["enabled"] ) ):
+        return()
+
+    # ------------------------------------------------- #
+    # --- [1] time & memory                         --- #
+    # ------------------------------------------------- #
+    now     = time.perf_counter()
+    record  = { "stage"  :stage, \
+                "time"   :now - profiler[ "subtime" if nested else "time" ], \
+                "elapsed":now - profiler["start"], \
+                "peakRSS":resource.getrusage( resource.RUSAGE_SELF ).ru_maxrss / 1024.0 }
+
+    # ------------------------------------------------- #
+    # --- [2] gmsh entity / node / element counts   --- #
+    # ------------------------------------------------- #
+    if ( count and gmsh.isInitialized() ):
+        record["entities"] = [ len( gmsh.model.getEntities( dim ) ) for dim in range(4) ]
+        record["nNodes"]   = len( gmsh.model.mesh.getNodes()[0] )
+        record["nElems"]   = int( sum( [ len( tags ) for tags in gmsh.model.mesh.getElements()[1] ] ) )
+    else:
+        record["entities"], record["nNodes"], record["nElems"] = [0,0,0,0], 0, 0
+    profiler["records"].append( record )
+    profiler["subtime"] = time.perf_counter()
+    if ( not( nested ) ):
+        profiler["time"] = profiler["subtime"]
+    return()
+
+
+# ========================================================= #
+# ===  write profile ( json & table )                   === #
+# ========================================================= #
+
+def write__profile( outDir="msh", name="profile" ):
+
+    if ( not( profiler["enabled"] ) ):
+        return()
+    os.makedirs( outDir, exist_ok=True )
+    jsonFile = os.path.join( outDir, name + ".json" )
+    tblFile  = os.path.join( outDir, name + ".dat"  )
+    with open( jsonFile, "w" ) as f:
+        json.dump( profiler["records"], f, indent=2 )
+    fmt      = "{0:<40} {1:>10} {2:>10} {3:>12} {4:>24} {5:>10} {6:>12}"
+    lines    = [ fmt.format( "# stage", "time[s]", "elapsed[s]", "peakRSS[MB]", \
+                             "entities(0/1/2/3)", "nodes", "elements" ) ]
+    for rec in profiler["records"]:
+        lines.append( fmt.format( rec["stage"], "{0:.3f}".format( rec["time"] ), \
+                                  "{0:.3f}".format( rec["elapsed"] ), \
+                                  "{0:.1f}".format( rec["peakRSS"] ), \
+                                  "/".join( [ str( n ) for n in rec["entities"] ] ), \
+                                  rec["nNodes"], rec["nElems"] ) )
+    with open( tblFile, "w" ) as f:
+        f.write( "\n".join( lines ) + "\n" )
+    print( "\n".join( lines ) )
+    print( "[write__profile] outFile :: {0}, {1}".format( jsonFile, tblFile ) )
+    return()
@@ -0,0 +1,132 @@
+import os, sys, time, itertools, traceback
+import multiprocessing, concurrent.futures
+
+
+# ========================================================= #
+# ===  parametric sweep of make__magnet                 === #
+# ========================================================= #
+
+def sweep__magnet( overrides=None, grid=None, inpDir="dat", sweepDir="sweep", nprocs=2 ):
+
+    # ------------------------------------------------- #
+    # --- [1] list of variants                      --- #
+    # ------------------------------------------------- #
+    #  -- overrides :: [ {key:value,...}, ... ]     --  #
+    #  -- grid      :: { key:[values], ... } ( all combinations ) --  #
+    #  -- key "mesh:<name>" overrides resolution of <name> in mesh.conf --  #
+    if ( overrides is None ):
+        overrides = []
+    else:
+        overrides = list( overrides )
+    if ( grid is not None ):
+        keys      = list( grid.keys() )
+        overrides = overrides + [ dict( zip( keys, values ) ) for values in \
+                                  itertools.product( *[ grid[key] for key in keys ] ) ]
+    if ( len( overrides ) == 0 ):
+        sys.exit( "[sweep__magnet] no variants ( overrides / grid ) ??? " )
+
+    # ------------------------------------------------- #
+    # --- [2] run on a bounded process pool         --- #
+    # ------------------------------------------------- #
+    #  -- pole cache is shared among the variants   --  #
+    cacheDir = os.path.join( sweepDir, "cache" )
+    os.makedirs( sweepDir, exist_ok=True )
+    context  = multiprocessing.get_context( "spawn" )
+    with concurrent.futures.ProcessPoolExecutor( max_workers=nprocs, mp_context=context ) as pool:
+        jobs    = [ pool.submit( run__variant, override=override, inpDir=inpDir, \
+                                 outDir=os.path.join( sweepDir, "case_{0:04d}".format( ik ) ), \
+                                 cacheDir=cacheDir ) \
+                    for ik,override in enumerate( overrides ) ]
+        results = [ job.result() for job in jobs ]
+
+    # ------------------------------------------------- #
+    # --- [3] summary table                         --- #
+    # ------------------------------------------------- #
+    outFile  = os.path.join( sweepDir, "summary.dat" )
+    write__summary( results=results, outFile=outFile )
+    return( results )
+
+
+# ========================================================= #
+# ===  run one variant ( in a worker process )          === #
+# ========================================================= #
+
+def run__variant( override=None, inpDir="dat", outDir=None, cacheDir=None ):
+
+    ret   = { "outDir":outDir, "override":override, "status":"failed", \
+              "time":0.0, "nNodes":0, "nElems":0, "outFiles":[], "error":"" }
+    time1 = time.perf_counter()
+    try:
+        # -- [1] config & mesh.conf of the variant  -- #
+        os.makedirs( outDir, exist_ok=True )
+        cnsFile  = os.path.join( inpDir, "parameter.conf" )
+        import nkUtilities.load__constants as lcn
+        const    = lcn.load__constants( inpFile=cnsFile )
+        const["geometry.pole_cache_dir"] = cacheDir
+        meshs    = { key[5:]:val for key,val in override.items() if key.startswith( "mesh:" ) }
+        const.update( { key:val for key,val in override.items() if not( key.startswith( "mesh:" ) ) } )
+        meshFile = write__meshConf( inpFile=os.path.join( inpDir, "mesh.conf" ), \
+                                    outFile=os.path.join( outDir, "mesh.conf" ), meshs=meshs )
+        # -- [2] make magnet                        -- #
+        import make__magnet as mkm
+        stat     = mkm.make__magnet( const=const, inpDir=inpDir, outDir=outDir, meshFile=meshFile )
+        ret.update( stat )
+        ret["status"] = "done"
+    except ( Exception, SystemExit ):
+        ret["error"]  = traceback.format_exc()
+        with open( os.path.join( outDir, "error.log" ), "w" ) as f:
+            f.write( ret["error"] )
+    finally:
+        #  -- worker is reused :: never leave a failed variant's gmsh session behind --  #
+        import gmsh
+        if ( gmsh.isInitialized() ):
+            gmsh.finalize()
+    ret["time"] = time.perf_counter() - time1
+    return( ret )
+
+
+# ========================================================= #
+# ===  write mesh.conf with overridden resolutions      === #
+# ========================================================= #
+
+def write__meshConf( inpFile=None, outFile=None, meshs={} ):
+
+    with open( inpFile, "r" ) as f:
+        lines = f.readlines()
+    for ik,line in enumerate( lines ):
+        words = line.split()
+        if ( ( len( words ) >= 3 ) and ( words[0] in meshs ) ):
+            lines[ik] = "{0}\t\t{1}\t\t{2}\n".format( words[0], words[1], meshs[words[0]] )
+    with open( outFile, "w" ) as f:
+        f.writelines( lines )
+    return( outFile )
+
+
+# ========================================================= #
+# ===  write / display summary table                    === #
+# ========================================================= #
+
+def write__summary( results=None, outFile=None ):
+
+    fmt   = "{0:<30} {1:>8} {2:>10} {3:>10} {4:>12}  {5}"
+    lines = [ fmt.format( "# outDir", "status", "time[s]", "nNodes", "nElems", "override / outFiles" ) ]
+    for ret in results:
+        lines.append( fmt.format( ret["outDir"], ret["status"], "{0:.2f}".format( ret["time"] ), \
+                                  ret["nNodes"], ret["nElems"], ret["override"] ) )
+        for outFile_ in ret["outFiles"]:
+            lines.append( "#  -> {0}".format( outFile_ ) )
+        if ( ret["status"] != "done" ):
+            lines.append( "#  !! {0}".format( ( ret["error"].strip().splitlines() or [""] )[-1] ) )
+    with open( outFile, "w" ) as f:
+        f.write( "\n".join( lines ) + "\n" )
+    print( "\n".join( lines ) )
+    print( "[write__summary] outFile :: {0}".format( outFile ) )
+    return()
+
+
+# ========================================================= #
+# ===   実行部                                          === #
+# ========================================================= #
+if ( __name__=="__main__" ):
+    grid = { "geometry.r_pole":[ 0.9, 1.0 ], "mesh:gap":[ 0.10, 0.05 ] }
+    sweep__magnet( grid=grid, nprocs=2 )
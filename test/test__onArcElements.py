@@ -0,0 +1,56 @@
+import os, sys
+import numpy  as np
+import pytest
+
+pyDir  = os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), "..", "pyt" )
+datDir = os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), "..", "dat" )
+sys.path.insert( 0, pyDir )
+gmsh   = pytest.importorskip( "gmsh" )
+import generate__poleLayer as gpl
+import manage__pointData   as mpd
+
+
+# ========================================================= #
+# ===  former per-element loop ( reference )            === #
+# ========================================================= #
+def reference__onArcElements( connectivities=None, pointData=None, radius=None ):
+
+    eps              = 1.e-8
+    x_, y_, z_       = 0, 1, 2
+    onArc_check    = np.zeros( ( connectivities.shape[0], ), dtype=np.int64 )
+    for ik,cnc in enumerate(connectivities):
+        pt1 = pointData[ cnc[0], : ]
+        pt2 = pointData[ cnc[1], : ]
+        pt3 = pointData[ cnc[2], : ]
+        dr1 = np.sqrt( pt1[x_]**2 + pt1[y_]**2 ) - radius
+        dr2 = np.sqrt( pt2[x_]**2 + pt2[y_]**2 ) - radius
+        dr3 = np.sqrt( pt3[x_]**2 + pt3[y_]**2 ) - radius
+        if   ( ( dr2 > -eps ) and ( dr2 < +eps ) and ( dr3 > -eps ) and ( dr3 < +eps ) ):
+            onArc_check[ik] = 1
+        elif ( ( dr1 > -eps ) and ( dr1 < +eps ) and ( dr3 > -eps ) and ( dr3 < +eps ) ):
+            onArc_check[ik] = 2
+        elif ( ( dr1 > -eps ) and ( dr1 < +eps ) and ( dr2 > -eps ) and ( dr2 < +eps ) ):
+            onArc_check[ik] = 3
+    onArc_index    = ( np.where( onArc_check >  0 ) )[0]
+    other_index    = ( np.where( onArc_check == 0 ) )[0]
+    ret = { "onArc_index":onArc_index, "other_index":other_index, "onArc_check":onArc_check }
+    return( ret )
+
+
+# ========================================================= #
+# ===  vectorized == loop on the bundled meshes         === #
+# ========================================================= #
+@pytest.mark.parametrize( "name", [ "right", "left", "both" ] )
+def test__onArcElements( name ):
+
+    #  -- text point file :: "# ..." header lines, then x y z rows --  #
+    pointData      = np.loadtxt( os.path.join( datDir, "onmesh_{0}.dat".format( name ) ), comments="#" )
+    connectivities = mpd.load__elementData( inpFile=os.path.join( datDir, "mesh_{0}.elements".format( name ) ) )
+    connectivities = np.array( connectivities[:,3:], dtype=np.int64 ) - 1
+    radius         = 1.0
+    ref            = reference__onArcElements( connectivities=connectivities, pointData=pointData, radius=radius )
+    ret            = gpl.investigate__onArcElements( connectivities=connectivities, pointData=pointData, radius=radius )
+    assert ( ref["onArc_index"].shape[0] > 0 )
+    for key in [ "onArc_index", "other_index", "onArc_check" ]:
+        assert ( ret[key].dtype == ref[key].dtype )
+        np.testing.assert_array_equal( ret[key], ref[key] )